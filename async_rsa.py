@@ -0,0 +1,130 @@
+import asyncio
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import generate_prime
+import rsa
+
+
+class AsyncRSA:
+    """
+    asyncio facade for key generation, encryption and decryption.
+    the exponentiations run in an executor, so they never block the event loop. at most 'concurrency' jobs
+    are handed to the executor at a time, further requests wait for a free slot (backpressure).
+    """
+
+    def __init__(self, concurrency=None, executor=None):
+        """
+        :param concurrency: the maximal amount of jobs running at a time. None uses all the available cores
+        :type concurrency: int | None
+        :param executor: the executor to run the jobs in. None creates a process pool of 'concurrency' workers,
+                         a thread pool would still block the event loop, since pow holds the GIL
+        :type executor: concurrent.futures.Executor | None
+        """
+
+        self.concurrency = concurrency if concurrency is not None else os.cpu_count() or 1
+        self.own_executor = executor is None  # only an executor created here is shut down by close
+        self.executor = executor if executor is not None else ProcessPoolExecutor(max_workers=self.concurrency)
+        self.slots = asyncio.Semaphore(self.concurrency)
+
+    async def run(self, func, *args):
+        """
+        runs a function in the executor, once a slot is free.
+
+        :param func: the function, picklable when the executor is a process pool
+        :type func: function
+        :return: the function's return value
+        """
+
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def generate_prime(self, bits, lucas=False):
+        """
+        generates a high probability prime number of n bits.
+        the search is handed to the executor a single window at a time, so cancelling the coroutine stops it
+        after the current window, and other requests get slots between windows.
+
+        :param bits: the amount of bits in the number
+        :type bits: int
+        :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+        :type lucas: bool
+        :return: the high probability prime number
+        :rtype: int
+        """
+
+        if generate_prime.is_window_searchable(bits) is False:
+            return await self.run(generate_prime.get_prime, bits, 1, lucas)
+
+        prime = None
+        while prime is None:
+            # the seed is drawn here, so that forked workers don't repeat each other's candidates
+            prime, _ = await self.run(generate_prime.search_window_seeded, bits, random.getrandbits(256), lucas)
+        return prime
+
+    async def generate_keys(self, key_size, lucas=False, primes=2):
+        """
+        generates a new pair of RSA private and public keys of a given size, searching for all the primes at once.
+        cancelling the coroutine cancels all the searches.
+
+        :param key_size: the size of the modulus in bits
+        :type key_size: int
+        :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+        :type lucas: bool
+        :param primes: the amount of primes, more than 2 makes a multi-prime key (see rsa.max_primes)
+        :type primes: int
+        :return: the private and public keys in a tuple ((n, e), (n, d, p, q, dP, dQ, qInv)),
+                 the private key followed by (r, d, t) of every additional prime
+        :rtype: tuple[tuple[int]]
+        """
+
+        sizes = rsa.get_prime_sizes(key_size, primes)
+        found = list(await asyncio.gather(*(self.generate_prime(bits, lucas) for bits in sizes)))
+
+        i = rsa.get_unfit_prime(found, key_size)
+        while i is not None:
+            found[i] = await self.generate_prime(sizes[i], lucas)
+            i = rsa.get_unfit_prime(found, key_size)
+        return rsa.get_keys(*found)
+
+    async def encrypt(self, msg, pub_key):
+        """
+        encrypts a message, see rsa.encrypt.
+
+        :param msg: the message
+        :type msg: str
+        :param pub_key: recipient's public key (n, e)
+        :type pub_key: tuple[int] | keys.PublicKey
+        :return: the encrypted blocks
+        :rtype: list[int]
+        """
+
+        return await self.run(rsa.encrypt, msg, tuple(pub_key))
+
+    async def decrypt(self, encrypted_blocks, private_key):
+        """
+        decrypts a message, see rsa.decrypt.
+
+        :param encrypted_blocks: the encrypted blocks
+        :type encrypted_blocks: list[int]
+        :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+        :type private_key: tuple[int] | keys.PrivateKey
+        :return: the decrypted message
+        :rtype: str
+        """
+
+        return await self.run(rsa.decrypt, encrypted_blocks, tuple(private_key))
+
+    def close(self):
+        """
+        shuts down the executor, if it was created here. jobs that haven't started are cancelled.
+        """
+
+        if self.own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,277 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+import generate_prime
+import my_utilities
+import rsa
+
+# message sizes, in bytes, for the encrypt/decrypt throughput
+MESSAGE_SIZES = [1024, 16 * 1024, 256 * 1024]
+
+# command lines timed by the startup suite, each in a fresh interpreter
+STARTUP_COMMANDS = {'import': ['-c', 'import main'], 'help': ['main.py', '--help']}
+
+
+def percentile(samples, pct):
+    """
+    computes a percentile of the samples, interpolating linearly between the closest ranks.
+
+    :param samples: the samples
+    :type samples: list[float]
+    :param pct: the percentile, between 0 and 100
+    :type pct: float
+    :return: the percentile
+    :rtype: float
+    """
+
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """
+    summarizes timing samples.
+
+    :param samples: the samples, in seconds
+    :type samples: list[float]
+    :return: the amount of samples, mean, standard deviation, min, max and the p50/p90/p99 percentiles
+    :rtype: dict
+    """
+
+    return {
+        'runs': len(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min': min(samples),
+        'p50': percentile(samples, 50),
+        'p90': percentile(samples, 90),
+        'p99': percentile(samples, 99),
+        'max': max(samples),
+    }
+
+
+def time_call(func, *args, **kwargs):
+    """
+    times a single call.
+
+    :param func: the called function
+    :type func: function
+    :return: the elapsed time, in seconds
+    :rtype: float
+    """
+
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def bench_keygen(sizes, runs, jobs):
+    """
+    measures the key generation time distribution for each key size.
+
+    :param sizes: the key sizes, in bits
+    :type sizes: list[int]
+    :param runs: the amount of keys generated per size
+    :type runs: int
+    :param jobs: the amount of worker processes per key generation
+    :type jobs: int | None
+    :return: the time summary (seconds) per key size
+    :rtype: dict
+    """
+
+    return {str(bits): summarize([time_call(rsa.generate_keys, bits, jobs) for _ in range(runs)]) for bits in sizes}
+
+
+def bench_primality(sizes, runs):
+    """
+    measures the time of the probabilistic tests on a known prime, the worst case, for each size.
+
+    :param sizes: the key sizes, in bits. the primes are half of each size
+    :type sizes: list[int]
+    :param runs: the amount of tests per size and mode
+    :type runs: int
+    :return: the time summary (seconds) per size and mode
+    :rtype: dict
+    """
+
+    results = {}
+    for bits in sizes:
+        prime = generate_prime.get_prime(bits // 2)
+        results[str(bits // 2)] = {
+            'miller_rabin': summarize([time_call(generate_prime.check_high_level_prime, prime) for _ in range(runs)]),
+            'baillie_psw': summarize([time_call(generate_prime.check_high_level_prime, prime, True)
+                                      for _ in range(runs)]),
+        }
+    return results
+
+
+def bench_modexp(sizes, runs):
+    """
+    measures exponentiations per second for each registered backend, with full-size and public exponents.
+    the exponentiations go through a single arithmetic context per modulus, as the key objects do.
+
+    :param sizes: the modulus sizes, in bits
+    :type sizes: list[int]
+    :param runs: the amount of exponentiations per size, backend and exponent
+    :type runs: int
+    :return: the exponentiations per second, and the time summary (seconds), per size, backend and exponent
+    :rtype: dict
+    """
+
+    results = {}
+    for bits in sizes:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        context = my_utilities.ModContext(n)
+        exponents = {'full': random.getrandbits(bits), 'e65537': 65537}
+        results[str(bits)] = {}
+        for backend in my_utilities.MOD_EXP_BACKENDS:
+            results[str(bits)][backend] = {}
+            for name, k in exponents.items():
+                samples = [time_call(context.pow, random.getrandbits(bits) % n, k, backend)
+                           for _ in range(runs)]
+                summary = summarize(samples)
+                summary['ops_per_second'] = len(samples) / sum(samples)
+                results[str(bits)][backend][name] = summary
+    return results
+
+
+def bench_cipher(sizes, runs):
+    """
+    measures encrypt/decrypt throughput across message sizes, for each key size.
+
+    :param sizes: the key sizes, in bits
+    :type sizes: list[int]
+    :param runs: the amount of runs per key size and message size
+    :type runs: int
+    :return: the throughput (MB/s), and the time summary (seconds), per key size, message size and operation
+    :rtype: dict
+    """
+
+    results = {}
+    for bits in sizes:
+        pub, priv = rsa.generate_keys(bits, 1)
+        results[str(bits)] = {}
+        for size in MESSAGE_SIZES:
+            msg = ''.join(random.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(size))
+            encrypted_blocks = rsa.encrypt(msg, pub)
+
+            encrypt = summarize([time_call(rsa.encrypt, msg, pub) for _ in range(runs)])
+            encrypt['mb_per_second'] = size / encrypt['mean'] / 1e6
+            decrypt = summarize([time_call(rsa.decrypt, encrypted_blocks, priv) for _ in range(runs)])
+            decrypt['mb_per_second'] = size / decrypt['mean'] / 1e6
+            results[str(bits)][str(size)] = {'encrypt': encrypt, 'decrypt': decrypt}
+    return results
+
+
+def bench_startup(runs):
+    """
+    measures the command line's startup time, as seen by a user: a fresh interpreter per run.
+
+    :param runs: the amount of runs per command
+    :type runs: int
+    :return: the time summary (seconds), per command
+    :rtype: dict
+    """
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        results[name] = summarize([time_call(subprocess.run, [sys.executable] + command, cwd=cwd, check=True,
+                                             stdout=subprocess.DEVNULL) for _ in range(runs)])
+    return results
+
+
+SUITES = ['keygen', 'primality', 'modexp', 'cipher', 'startup']
+
+
+def run(suites, sizes, runs, seed, jobs):
+    """
+    runs the chosen benchmark suites.
+
+    :param suites: the suites' names, from SUITES
+    :type suites: list[str]
+    :param sizes: the key sizes, in bits
+    :type sizes: list[int]
+    :param runs: the amount of runs per measurement
+    :type runs: int
+    :param seed: the random seed, so that runs are reproducible
+    :type seed: int
+    :param jobs: the amount of worker processes per key generation
+    :type jobs: int | None
+    :return: the report: the run's metadata and each suite's results
+    :rtype: dict
+    """
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'sizes': sizes,
+            'runs': runs,
+            'jobs': jobs,
+            'public_backend': my_utilities.PUBLIC_BACKEND,
+            'private_backend': my_utilities.PRIVATE_BACKEND,
+            'numpy_sieve': generate_prime.has_numpy(),
+        },
+        'results': {},
+    }
+
+    for suite in suites:
+        random.seed(seed)  # every suite starts from the same state, so it can be run alone
+        if suite == 'keygen':
+            report['results'][suite] = bench_keygen(sizes, runs, jobs)
+        elif suite == 'primality':
+            report['results'][suite] = bench_primality(sizes, runs)
+        elif suite == 'modexp':
+            report['results'][suite] = bench_modexp(sizes, runs)
+        elif suite == 'startup':
+            report['results'][suite] = bench_startup(runs)
+        else:
+            report['results'][suite] = bench_cipher(sizes, runs)
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark',
+                                     description='Benchmarks key generation, primality, modexp, encrypt/decrypt '
+                                                 'and startup.')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help=f'suites to run, out of {", ".join(SUITES)} (default: all)')
+    parser.add_argument('--bits', type=int, nargs='+', default=[2048, 3072, 4096], help='key sizes in bits')
+    parser.add_argument('--runs', type=int, default=10, help='runs per measurement')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes per key generation (default: 1, deterministic for a given seed)')
+    parser.add_argument('--output', help='JSON output path (default: stdout)')
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f'unknown suite: {suite}')
+
+    report = run(args.suites or SUITES, args.bits, args.runs, args.seed, args.jobs)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
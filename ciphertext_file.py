@@ -0,0 +1,231 @@
+import mmap
+import struct
+from datetime import datetime
+import my_utilities
+
+# container format: header, then fixed-width big-endian encrypted blocks
+# header: magic, format version, block width in bytes, modulus fingerprint (SHA-256 of n)
+MAGIC = b'RSAC'
+VERSION = 1
+HEADER = struct.Struct('>4sBI32s')
+
+# legacy decimal text format: a header line, then a '\t- <block>' line per encrypted block
+TEXT_HEADER = 'RSA encrypted message blocks: '
+
+
+def write_header(out_file, n):
+    """
+    writes the container header for blocks encrypted under the modulus n.
+
+    :param out_file: binary file object to write the header to
+    :type out_file: typing.BinaryIO
+    :param n: the modulus the blocks are encrypted under
+    :type n: int
+    :return: the width of each block in bytes
+    :rtype: int
+    """
+
+    width = (n.bit_length() + 7) // 8  # every encrypted block is smaller than n
+    out_file.write(HEADER.pack(MAGIC, VERSION, width, my_utilities.fingerprint(n)))
+    return width
+
+
+def read_header(data):
+    """
+    parses and validates a container header.
+
+    :param data: the beginning of the container, at least HEADER.size bytes long
+    :type data: bytes | memoryview
+    :return: the block width in bytes, and the modulus fingerprint
+    :rtype: tuple[int, bytes]
+    """
+
+    if len(data) < HEADER.size:
+        raise ValueError("Encrypted file is too short for a header")
+
+    magic, version, width, fingerprint = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an encrypted container file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported encrypted container version: {version}")
+    if width == 0:
+        raise ValueError("Encrypted container has an invalid block width")
+
+    return width, fingerprint
+
+
+def check_key(fingerprint, n):
+    """
+    checks that a container was encrypted under a given modulus.
+
+    :param fingerprint: the modulus fingerprint from the container header
+    :type fingerprint: bytes
+    :param n: the modulus of the key used for decryption
+    :type n: int
+    """
+
+    if fingerprint != my_utilities.fingerprint(n):
+        raise ValueError("Encrypted file was encrypted under a different modulus")
+
+
+def is_container(path):
+    """
+    checks whether a file starts with the container magic.
+
+    :param path: the file's path
+    :type path: str
+    :return: True if the file is a container, False otherwise
+    :rtype: bool
+    """
+
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_blocks(path, blocks, n):
+    """
+    saves encrypted blocks into a container file.
+
+    :param path: the container's path
+    :type path: str
+    :param blocks: the encrypted blocks
+    :type blocks: list[int]
+    :param n: the modulus the blocks are encrypted under
+    :type n: int
+    """
+
+    with open(path, 'wb') as f:
+        width = write_header(f, n)
+        for block in blocks:
+            f.write(block.to_bytes(width, byteorder='big'))
+
+
+def iter_text_blocks(in_file):
+    """
+    reads encrypted blocks from the legacy decimal text format, a line at a time.
+    the digits are converted by my_utilities.int_from_decimal, which isn't limited to 4300 digits.
+
+    :param in_file: text file object, positioned at the header line
+    :type in_file: typing.TextIO
+    :return: the encrypted blocks
+    :rtype: generator[int]
+    """
+
+    in_file.readline()  # the header, holding the encryption time
+    for line in in_file:
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith('- '):
+            raise ValueError("Encrypted text file's format isn't correct")
+        yield my_utilities.int_from_decimal(line[2:])
+
+
+def write_text_blocks(out_file, blocks):
+    """
+    writes encrypted blocks in the legacy decimal text format, a line at a time.
+
+    :param out_file: text file object to write the blocks to
+    :type out_file: typing.TextIO
+    :param blocks: the encrypted blocks
+    :type blocks: typing.Iterable[int]
+    :return: the amount of blocks written
+    :rtype: int
+    """
+
+    out_file.write(f'{TEXT_HEADER}{datetime.now().strftime("%d/%m/%Y %H:%M:%S")}\n')
+    count = 0
+    for block in blocks:
+        out_file.write(f'\t- {my_utilities.int_to_decimal(block)}\n')
+        count += 1
+    return count
+
+
+def load_text_blocks(path):
+    """
+    loads the encrypted blocks saved in the legacy decimal text format.
+
+    :param path: the text file's path
+    :type path: str
+    :return: the encrypted blocks
+    :rtype: list[int]
+    """
+
+    with open(path, 'r') as f:
+        return list(iter_text_blocks(f))
+
+
+def save_text_blocks(path, blocks):
+    """
+    saves encrypted blocks in the legacy decimal text format.
+
+    :param path: the text file's path
+    :type path: str
+    :param blocks: the encrypted blocks
+    :type blocks: typing.Iterable[int]
+    """
+
+    with open(path, 'w') as f:
+        write_text_blocks(f, blocks)
+
+
+class CiphertextFile:
+    """
+    read-only view of a container file.
+    the file is memory-mapped, and blocks are converted to ints straight from zero-copy slices of the mapping.
+    """
+
+    def __init__(self, path):
+        """
+        opens and validates a container file.
+
+        :param path: the container's path
+        :type path: str
+        """
+
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Encrypted file is too short for a header")
+        self._view = memoryview(self._map)
+
+        try:
+            self.width, self.fingerprint = read_header(self._view)
+            if (len(self._view) - HEADER.size) % self.width != 0:
+                raise ValueError("Encrypted file is truncated")
+        except ValueError:
+            self.close()
+            raise
+
+    def __len__(self):
+        return (len(self._view) - HEADER.size) // self.width
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Block index out of range")
+
+        offset = HEADER.size + i * self.width
+        return int.from_bytes(self._view[offset:offset + self.width], byteorder='big')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        """
+        releases the memory mapping and closes the file.
+        """
+
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,113 @@
+import sys
+import threading
+from collections import OrderedDict
+import keys
+
+
+class DecryptionCache:
+    """
+    bounded LRU cache of decrypted blocks, by key fingerprint and encrypted block.
+    keys are told apart by their private exponent too, so a key that only shares the modulus never gets a hit.
+    a repeated block is decrypted once instead of costing another private-key exponentiation.
+    it holds plaintext in memory, so it is never used unless passed explicitly to rsa.decrypt and friends.
+    """
+
+    def __init__(self, max_entries=4096, max_bytes=16 << 20):
+        """
+        :param max_entries: the maximal amount of cached blocks
+        :type max_entries: int
+        :param max_bytes: the maximal memory taken by the cached blocks' ints, in bytes
+        :type max_bytes: int
+        """
+
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("Cache limits must not be negative")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (fingerprint, encrypted block): (decrypted block, size), least recent first
+        self.size = 0  # memory taken by the cached ints, in bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, fingerprint, block):
+        """
+        :param fingerprint: the fingerprint of the key's modulus and private exponent, see
+                            keys.PrivateKey.secret_fingerprint
+        :type fingerprint: bytes
+        :param block: the encrypted block
+        :type block: int
+        :return: the decrypted block, or None if it isn't cached
+        :rtype: int | None
+        """
+
+        with self.lock:
+            entry = self.entries.get((fingerprint, block))
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end((fingerprint, block))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, fingerprint, block, decrypted_block):
+        """
+        caches a decrypted block, evicting the least recently used ones to stay within the limits.
+
+        :param fingerprint: the fingerprint of the key's modulus and private exponent, see
+                            keys.PrivateKey.secret_fingerprint
+        :type fingerprint: bytes
+        :param block: the encrypted block
+        :type block: int
+        :param decrypted_block: the decrypted block
+        :type decrypted_block: int
+        """
+
+        size = sys.getsizeof(block) + sys.getsizeof(decrypted_block)
+        if size > self.max_bytes or self.max_entries == 0:
+            return
+
+        with self.lock:
+            previous = self.entries.pop((fingerprint, block), None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[(fingerprint, block)] = (decrypted_block, size)
+            self.size += size
+
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self, private_key=None):
+        """
+        removes cached blocks.
+
+        :param private_key: the key whose blocks are removed. None removes all the blocks
+        :type private_key: tuple[int] | keys.PrivateKey | None
+        """
+
+        with self.lock:
+            if private_key is None:
+                self.entries.clear()
+                self.size = 0
+                return
+
+            fingerprint = keys.get_private_key(private_key).secret_fingerprint
+            for entry in [entry for entry in self.entries if entry[0] == fingerprint]:
+                self.size -= self.entries.pop(entry)[1]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        """
+        :return: the hits, misses, evictions, cached blocks and their memory in bytes
+        :rtype: dict
+        """
+
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.entries), 'bytes': self.size}
@@ -1,35 +1,200 @@
+import os
 import random
+import sys
+import time
 import my_utilities
+import low_level_prime
+from contextlib import contextmanager
 
-# achieved from low_level_prime.py
-FIRST500PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101,
-                  103, 107, 109, 113, 127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199,
-                  211, 223, 227, 229, 233, 239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311, 313, 317,
-                  331, 337, 347, 349, 353, 359, 367, 373, 379, 383, 389, 397, 401, 409, 419, 421, 431, 433, 439, 443,
-                  449, 457, 461, 463, 467, 479, 487, 491, 499, 503, 509, 521, 523, 541, 547, 557, 563, 569, 571, 577,
-                  587, 593, 599, 601, 607, 613, 617, 619, 631, 641, 643, 647, 653, 659, 661, 673, 677, 683, 691, 701,
-                  709, 719, 727, 733, 739, 743, 751, 757, 761, 769, 773, 787, 797, 809, 811, 821, 823, 827, 829, 839,
-                  853, 857, 859, 863, 877, 881, 883, 887, 907, 911, 919, 929, 937, 941, 947, 953, 967, 971, 977, 983,
-                  991, 997, 1009, 1013, 1019, 1021, 1031, 1033, 1039, 1049, 1051, 1061, 1063, 1069, 1087, 1091, 1093,
-                  1097, 1103, 1109, 1117, 1123, 1129, 1151, 1153, 1163, 1171, 1181, 1187, 1193, 1201, 1213, 1217, 1223,
-                  1229, 1231, 1237, 1249, 1259, 1277, 1279, 1283, 1289, 1291, 1297, 1301, 1303, 1307, 1319, 1321, 1327,
-                  1361, 1367, 1373, 1381, 1399, 1409, 1423, 1427, 1429, 1433, 1439, 1447, 1451, 1453, 1459, 1471, 1481,
-                  1483, 1487, 1489, 1493, 1499, 1511, 1523, 1531, 1543, 1549, 1553, 1559, 1567, 1571, 1579, 1583, 1597,
-                  1601, 1607, 1609, 1613, 1619, 1621, 1627, 1637, 1657, 1663, 1667, 1669, 1693, 1697, 1699, 1709, 1721,
-                  1723, 1733, 1741, 1747, 1753, 1759, 1777, 1783, 1787, 1789, 1801, 1811, 1823, 1831, 1847, 1861, 1867,
-                  1871, 1873, 1877, 1879, 1889, 1901, 1907, 1913, 1931, 1933, 1949, 1951, 1973, 1979, 1987, 1993, 1997,
-                  1999, 2003, 2011, 2017, 2027, 2029, 2039, 2053, 2063, 2069, 2081, 2083, 2087, 2089, 2099, 2111, 2113,
-                  2129, 2131, 2137, 2141, 2143, 2153, 2161, 2179, 2203, 2207, 2213, 2221, 2237, 2239, 2243, 2251, 2267,
-                  2269, 2273, 2281, 2287, 2293, 2297, 2309, 2311, 2333, 2339, 2341, 2347, 2351, 2357, 2371, 2377, 2381,
-                  2383, 2389, 2393, 2399, 2411, 2417, 2423, 2437, 2441, 2447, 2459, 2467, 2473, 2477, 2503, 2521, 2531,
-                  2539, 2543, 2549, 2551, 2557, 2579, 2591, 2593, 2609, 2617, 2621, 2633, 2647, 2657, 2659, 2663, 2671,
-                  2677, 2683, 2687, 2689, 2693, 2699, 2707, 2711, 2713, 2719, 2729, 2731, 2741, 2749, 2753, 2767, 2777,
-                  2789, 2791, 2797, 2801, 2803, 2819, 2833, 2837, 2843, 2851, 2857, 2861, 2879, 2887, 2897, 2903, 2909,
-                  2917, 2927, 2939, 2953, 2957, 2963, 2969, 2971, 2999, 3001, 3011, 3019, 3023, 3037, 3041, 3049, 3061,
-                  3067, 3079, 3083, 3089, 3109, 3119, 3121, 3137, 3163, 3167, 3169, 3181, 3187, 3191, 3203, 3209, 3217,
-                  3221, 3229, 3251, 3253, 3257, 3259, 3271, 3299, 3301, 3307, 3313, 3319, 3323, 3329, 3331, 3343, 3347,
-                  3359, 3361, 3371, 3373, 3389, 3391, 3407, 3413, 3433, 3449, 3457, 3461, 3463, 3467, 3469, 3491, 3499,
-                  3511, 3517, 3527, 3529, 3533, 3539, 3541, 3547, 3557, 3559, 3571]
+# optional, loaded on the first vectorized sieve (see has_numpy). None when it isn't installed
+numpy = my_utilities.lazy_import('numpy')
+
+# amount of odd candidates (candidate + 2k) sieved together from one random starting point
+SIEVE_WINDOW = 4096
+
+# (minimal bits, amount of small primes): candidates are sieved against more primes as they grow,
+# because each Miller-Rabin round rejected by a small prime saves more time
+SMALL_PRIME_COUNTS = [(1536, 8192), (1024, 4096), (0, 2048)]
+
+# (minimal bits, rounds): Miller-Rabin rounds for a random candidate, keeping the average-case error below 2^-128.
+# computed with the Damgard-Landrock-Pomerance bound, as in FIPS 186-5 appendix B.1, never less than 4 rounds.
+# smaller candidates keep the worst-case 64 rounds (4^-64 = 2^-128).
+MILLER_RABIN_ROUNDS = [(1345, 4), (1080, 5), (906, 6), (782, 7), (691, 8), (620, 9), (563, 10), (517, 11), (479, 12)]
+
+# precomputed tables are kept next to the compiled modules, and are rebuilt if missing or stale
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+
+
+def __getattr__(name):
+    """
+    builds the legacy FIRST500PRIMES list on its first use, instead of at import.
+    """
+
+    if name == 'FIRST500PRIMES':
+        return get_prime_table(500)[0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PrimeStats:
+    """
+    counters of the prime generation hot path, collected only inside collect_stats().
+    """
+
+    FIELDS = ['windows', 'candidates', 'low_level_rejected', 'miller_rabin_rounds', 'lucas_tests', 'modexp_seconds']
+
+    def __init__(self):
+        self.windows = 0  # sieve windows drawn
+        self.candidates = 0  # candidates drawn, including the ones scanned in a window
+        self.low_level_rejected = 0  # candidates rejected by the small primes
+        self.miller_rabin_rounds = 0  # Miller-Rabin rounds executed, including the fixed bases
+        self.lucas_tests = 0  # strong Lucas tests executed
+        self.modexp_seconds = 0.0  # time spent in modular exponentiation
+        self.elapsed_seconds = 0.0  # wall-clock time of the collect_stats() block
+
+    def merge(self, other):
+        """
+        adds the counters of another run, such as a worker process' window, to these ones.
+
+        :param other: the other run's counters
+        :type other: PrimeStats
+        """
+
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def as_dict(self):
+        """
+        :return: the counters by name
+        :rtype: dict
+        """
+
+        return {field: getattr(self, field) for field in self.FIELDS + ['elapsed_seconds']}
+
+    def report(self):
+        """
+        :return: a human-readable profile of the counters
+        :rtype: str
+        """
+
+        survivors = self.candidates - self.low_level_rejected
+        return (f'Prime generation profile ({self.elapsed_seconds:.2f}s):\n'
+                f'\t- Sieve windows drawn: {self.windows}\n'
+                f'\t- Candidates drawn: {self.candidates}\n'
+                f'\t- Rejected by small primes: {self.low_level_rejected}\n'
+                f'\t- Reached the probabilistic tests: {survivors}\n'
+                f'\t- Miller-Rabin rounds: {self.miller_rabin_rounds}\n'
+                f'\t- Strong Lucas tests: {self.lucas_tests}\n'
+                f'\t- Time in modular exponentiation: {self.modexp_seconds:.2f}s')
+
+
+# counters of the current collect_stats() block. None when disabled, so the hot path pays a single check
+stats = None
+
+
+@contextmanager
+def collect_stats():
+    """
+    collects PrimeStats for the prime generation done inside the block, including worker processes.
+
+    :return: the counters, filled in while the block runs
+    :rtype: PrimeStats
+    """
+
+    global stats
+    previous, stats = stats, PrimeStats()
+    collected = stats
+    start = time.perf_counter()
+    try:
+        yield collected
+    finally:
+        collected.elapsed_seconds = time.perf_counter() - start
+        stats = previous
+
+
+# amount of small primes: (primes, products for residues, products for trial division), built on first use
+prime_tables = {}
+
+
+def get_prime_table(count):
+    """
+    gets the table of the first small primes, with their products, loading it on the first use.
+    it is loaded from its precomputed file in TABLE_DIR, or built and saved there if the file is missing or stale
+    (built for another amount of primes, or with other product sizes).
+
+    :param count: the amount of small primes
+    :type count: int
+    :return: the primes, their products for computing residues, and their products for trial division
+    :rtype: tuple[list[int], list[tuple[int, list[int]]], list[tuple[int, list[int]]]]
+    """
+
+    if count not in prime_tables:
+        path = os.path.join(TABLE_DIR, f'small_primes_{count}.bin')
+        try:
+            table = low_level_prime.load_prime_table(path)
+        except (OSError, ValueError):
+            table = None
+
+        if table is None or len(table[0]) != count:
+            primes = low_level_prime.get_n_primes(count)
+            table = (primes,
+                     low_level_prime.get_prime_products(primes[1:], low_level_prime.RESIDUE_PRODUCT_BITS),
+                     low_level_prime.get_prime_products(primes, low_level_prime.TRIAL_PRODUCT_BITS))
+            try:
+                os.makedirs(TABLE_DIR, exist_ok=True)
+                low_level_prime.save_prime_table(path, *table)
+            except OSError:
+                pass  # a read-only install rebuilds the table on every run
+
+        prime_tables[count] = table
+    return prime_tables[count]
+
+
+# 32 bits limbs of a residue modulo a product of small primes, for the vectorized sieve
+RESIDUE_LIMBS = -(-low_level_prime.RESIDUE_PRODUCT_BITS // 32)
+
+# amount of small primes: NumPy arrays for the vectorized sieve, built on first use
+numpy_tables = {}
+
+
+def get_numpy_table(count):
+    """
+    gets the NumPy arrays of the odd small primes used by sieve_window_numpy, building them on the first use.
+
+    :param count: the amount of small primes
+    :type count: int
+    :return: the odd primes, the index of each one's product, 2^(32j) (mod prime) for every limb j,
+             and the inverse of 2 modulo each prime
+    :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+
+    if count not in numpy_tables:
+        _, residue_products, _ = get_prime_table(count)
+        primes = numpy.array([i for _, group in residue_products for i in group], dtype=numpy.uint32)
+        groups = numpy.repeat(numpy.arange(len(residue_products)), [len(group) for _, group in residue_products])
+        # 2^(32j) (mod prime), by multiplying by 2^32 (mod prime) once per limb, for all the primes at once
+        step = (1 << 32) % primes.astype(numpy.uint64)
+        limb_factors = numpy.empty((len(primes), RESIDUE_LIMBS), dtype=numpy.uint64)
+        limb_factors[:, 0] = 1
+        for j in range(1, RESIDUE_LIMBS):
+            limb_factors[:, j] = limb_factors[:, j - 1] * step % primes
+        numpy_tables[count] = (primes, groups, limb_factors, (primes.astype(numpy.uint64) + 1) // 2)
+    return numpy_tables[count]
+
+
+def get_small_prime_count(bits):
+    """
+    picks the amount of small primes for candidates of a given size, from SMALL_PRIME_COUNTS.
+
+    :param bits: the amount of bits in the candidate
+    :type bits: int
+    :return: the amount of small primes
+    :rtype: int
+    """
+
+    for min_bits, count in SMALL_PRIME_COUNTS:
+        if bits >= min_bits:
+            return count
+    return SMALL_PRIME_COUNTS[-1][1]
 
 
 def check_low_level_prime(candidate, lst):
@@ -46,13 +211,29 @@ def check_low_level_prime(candidate, lst):
     """
 
     for i in lst:
-        if candidate % i == 0 and i ** 2 <= candidate:
-            return False
+        if candidate % i == 0:
+            return candidate == i  # the only multiple of a prime that isn't composite is the prime itself
     return True
 
 
+def get_miller_rabin_rounds(bits):
+    """
+    picks the amount of Miller-Rabin rounds for a random candidate of a given size, from MILLER_RABIN_ROUNDS.
+
+    :param bits: the amount of bits in the candidate
+    :type bits: int
+    :return: the amount of rounds
+    :rtype: int
+    """
+
+    for min_bits, rounds in MILLER_RABIN_ROUNDS:
+        if bits >= min_bits:
+            return rounds
+    return 64
+
+
 # ofcourse n is odd, because low_level_prime check has been done
-def check_miller_rabin(n, rounds):
+def check_miller_rabin(n, rounds, bases=()):
     """
     performs the Miller-Rabin probabilistic primality test for n.
     If n is prime, the test will allways return True.
@@ -63,6 +244,8 @@ def check_miller_rabin(n, rounds):
     :param rounds: The amount of round that will be performed on n.
                    The more round, the lower the probability for a prime result for a composite number.
     :type rounds: int
+    :param bases: fixed bases tested before the random rounds, such as 2 as a fast deterministic pre-test
+    :type bases: tuple[int]
     :return: True if the number is probably prime.
              False if the number is surely composite.
     :rtype: bool
@@ -80,7 +263,10 @@ def check_miller_rabin(n, rounds):
         k += 1
         m //= 2
 
-    def surely_composite(a, m1, k1, n1):
+    # the arithmetic context of n, shared by all the rounds
+    context = my_utilities.ModContext(n)
+
+    def surely_composite(a, m1, k1, context1):
         """
         checks if a number is surely composite.
         uses a^(n-1) = a^m1^2^k1 (mod n)  (power tower).
@@ -91,69 +277,481 @@ def check_miller_rabin(n, rounds):
         :type m1: int
         :param k1: number, such that n-1= m1* 2^k1
         :type k1: int
-        :param n1: the modules
-        :type n1: int
+        :param context1: the arithmetic context of the modules
+        :type context1: my_utilities.ModContext
         :return: True if the number is surely composite.
                  False if the number is probably prime (in a probability of 0.75)
         :rtype: bool
         """
 
-        x = my_utilities.montgomery_ladder(a, m1, n1)  # a^m1 (mod n), securely and efficiently
+        if stats is None:
+            x = context1.pow(a, m1, my_utilities.PUBLIC_BACKEND)  # a^m1 (mod n), nothing secret here
+        else:
+            start = time.perf_counter()
+            x = context1.pow(a, m1, my_utilities.PUBLIC_BACKEND)
+            stats.modexp_seconds += time.perf_counter() - start
+            stats.miller_rabin_rounds += 1
         if x == 1 or x == n - 1:  # n-1 is equivalent to -1
-            return False  # a doesnt provide evidence about n1 compositeness
-        for _ in range(k1):
-            x = my_utilities.montgomery_ladder(x, 2, n1)
+            return False  # a doesnt provide evidence about n compositeness
+        for _ in range(k1 - 1):
+            x = context1.sqr(x)  # a single modular squaring
             if x == 1:
-                return True  # x was a none-trivial root of n1
+                return True  # x was a none-trivial root of n
             if x == n - 1:
                 return False
         return True
 
+    # Testing the fixed bases first, these reject almost every composite
+    for a in bases:
+        if a % n != 0 and surely_composite(a % n, m, k, context):
+            return False  # n is not a prime
+
     # Perform the Miller-Rabin test for 'rounds' times:
     for _ in range(rounds):
         a = random.randint(2, n - 2)
-        if surely_composite(a, m, k, n):
+        if surely_composite(a, m, k, context):
             return False  # n is not a prime
     return True  # n is prime in a probability of 1 - 4^(-rounds)
 
 
-def check_prime(n):
+def jacobi(a, n):
+    """
+    computes the Jacobi symbol (a/n).
+
+    :param a: the numerator
+    :type a: int
+    :param n: the denominator, an odd positive number
+    :type n: int
+    :return: the Jacobi symbol: 1, -1 or 0
+    :rtype: int
+    """
+
+    a %= n
+    result = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a  # quadratic reciprocity
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def check_strong_lucas(n):
+    """
+    performs the strong Lucas probable prime test for n, with Selfridge's parameters (method A).
+
+    :param n: The odd prime candidate
+    :type n: int
+    :return: True if the number is a strong Lucas probable prime.
+             False if the number is surely composite.
+    :rtype: bool
+    """
+
+    if stats is not None:
+        stats.lucas_tests += 1
+
+    # perfect squares have no D with (D/n) = -1
+    if my_utilities.is_square(n):
+        return False
+
+    # Selfridge: the first D in 5, -7, 9, -11, ... such that (D/n) = -1
+    d = 5
+    while jacobi(d, n) != -1:
+        if jacobi(d, n) == 0 and abs(d) != n:
+            return False  # d shares a factor with n
+        d = -d - 2 if d > 0 else -d + 2
+    p, q = 1, (1 - d) // 4
+
+    # Find m, k such that: n + 1 = m * 2^k
+    m, k = n + 1, 0
+    while m % 2 == 0:
+        k += 1
+        m //= 2
+
+    def half(x):
+        return (x + n if x % 2 else x) // 2 % n  # x / 2 (mod n)
+
+    # U_m, V_m and Q^m (mod n), going through the bits of m
+    u, v, qm = 1, p, q
+    for bit in bin(m)[3:]:
+        u, v, qm = u * v % n, (v * v - 2 * qm) % n, qm * qm % n
+        if bit == '1':
+            u, v, qm = half(p * u + v), half(d * u + p * v), qm * q % n
+
+    if u == 0 or v == 0:
+        return True
+    for _ in range(k - 1):
+        v, qm = (v * v - 2 * qm) % n, qm * qm % n
+        if v == 0:
+            return True
+    return False
+
+
+def check_baillie_psw(n):
+    """
+    performs the Baillie-PSW primality test: a base 2 Miller-Rabin test followed by a strong Lucas test.
+    no composite number passing it is known.
+
+    :param n: The odd prime candidate
+    :type n: int
+    :return: True if the number is probably prime.
+             False if the number is surely composite.
+    :rtype: bool
+    """
+
+    return check_miller_rabin(n, 0, (2,)) and check_strong_lucas(n)
+
+
+def check_high_level_prime(n, lucas=False):
+    """
+    performs the probabilistic primality tests on a candidate that has already passed the low-level check.
+
+    :param n: the given prime candidate, assumed to be drawn at random
+    :type n: int
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
+    :return: True, if the number is prime (with very high probability)
+             False, if the number is composite
+    :rtype: bool
+    """
+
+    if lucas:
+        return check_baillie_psw(n)
+
+    # base 2 is tested first, so composites are rejected before any random base is drawn
+    return check_miller_rabin(n, get_miller_rabin_rounds(n.bit_length()), (2,))
+
+
+def check_prime(n, lucas=False):
     """
     checks the primality of a given number.
 
-    :param n: the given prime candidate
+    :param n: the given prime candidate, assumed to be drawn at random
     :type n: int
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
     :return: True, if the number is prime (with very high probability)
              False, if the number is composite
     :rtype: bool
     """
 
-    # check for low-level prime
-    if check_low_level_prime(n, FIRST500PRIMES) is False:
+    if stats is not None:
+        stats.candidates += 1
+
+    # check for low-level prime, a whole group of small primes at a time when n is larger than all of them
+    primes, _, trial_products = get_prime_table(get_small_prime_count(n.bit_length()))
+    if n <= primes[-1]:
+        is_low_level_prime = check_low_level_prime(n, primes)
+    else:
+        is_low_level_prime = low_level_prime.check_coprime(n, trial_products)
+    if is_low_level_prime is False:
+        if stats is not None:
+            stats.low_level_rejected += 1
         return False
     # candidate has passed low-level check
 
     # check for high-level prime
-    # rounds is set for 64. The industrial error probability standard is 2^-128
-    if check_miller_rabin(n, 64) is False:
+    if check_high_level_prime(n, lucas) is False:
         return False
 
     # candidate has passed all checks and is very likely to be prime
     return True
 
 
-def get_prime(bits):
+def get_random_candidate(bits):
+    """
+    draws a random odd number of exactly 'bits' bits, with the top two bits set.
+    setting the two top bits ensures that the product of two such numbers has exactly 2 * bits bits.
+
+    :param bits: the amount of bits in the number
+    :type bits: int
+    :return: the random candidate
+    :rtype: int
+    """
+
+    return random.getrandbits(bits) | (3 << (bits - 2)) | 1
+
+
+def sieve_window(start, window, products):
+    """
+    sieves the odd candidates start + 2k, for k in range(window), against odd small primes.
+    the residues of start are computed once for the whole window, instead of a modulo per candidate.
+
+    :param start: the odd starting point of the window
+    :type start: int
+    :param window: the amount of candidates in the window
+    :type window: int
+    :param products: the odd small primes, grouped into products by low_level_prime.get_prime_products
+    :type products: list[tuple[int, list[int]]]
+    :return: the offsets k of the candidates that aren't divisible by any of the primes, in increasing order
+    :rtype: generator[int]
+    """
+
+    sieve = bytearray(b'\x01') * window
+    residues = low_level_prime.get_residues(start, products)
+    for i, r in zip((i for _, group in products for i in group), residues):
+        # first k such that start + 2k = 0 (mod i), which is k = -start * 2^-1 (mod i)
+        k = ((i - r) * ((i + 1) // 2)) % i
+        sieve[k::i] = bytes(len(range(k, window, i)))
+
+    k = sieve.find(1)
+    while k != -1:
+        yield k
+        k = sieve.find(1, k + 1)
+
+
+def sieve_window_numpy(start, window, count):
+    """
+    sieves the odd candidates start + 2k, for k in range(window), against odd small primes, with NumPy.
+    same as sieve_window, but the residues, the first multiple of every prime and the crossing out
+    are computed for all the primes at once with array operations, instead of a Python loop per prime.
+
+    :param start: the odd starting point of the window
+    :type start: int
+    :param window: the amount of candidates in the window
+    :type window: int
+    :param count: the amount of small primes, see get_small_prime_count
+    :type count: int
+    :return: the offsets k of the candidates that aren't divisible by any of the primes, in increasing order
+    :rtype: list[int]
+    """
+
+    _, residue_products, _ = get_prime_table(count)
+    primes, groups, limb_factors, halves = get_numpy_table(count)
+
+    # start is reduced once per product, then every residue is split into 32 bits limbs, r = sum(limb_j * 2^(32j)).
+    # each limb times 2^(32j) (mod prime) stays under 2^49, so the sums fit in 64 bits
+    residues = b''.join((start % product).to_bytes(4 * RESIDUE_LIMBS, byteorder='little')
+                        for product, _ in residue_products)
+    limbs = numpy.frombuffer(residues, dtype='<u4').reshape(-1, RESIDUE_LIMBS).astype(numpy.uint64)
+    residues = (limbs[groups] * limb_factors).sum(axis=1) % primes
+
+    # first k such that start + 2k = 0 (mod i), which is k = -start * 2^-1 (mod i)
+    first = ((primes - residues) * halves % primes).astype(numpy.int64)
+    steps = primes.astype(numpy.int64)
+
+    # every multiple k + j * i inside the window is crossed out in a single scatter
+    multiples = numpy.where(first < window, (window - 1 - first) // steps + 1, 0)
+    offsets = numpy.arange(multiples.sum()) - numpy.repeat(numpy.cumsum(multiples) - multiples, multiples)
+    sieve = numpy.ones(window, dtype=bool)
+    sieve[numpy.repeat(first, multiples) + numpy.repeat(steps, multiples) * offsets] = False
+
+    return numpy.flatnonzero(sieve).tolist()
+
+
+def is_window_searchable(bits):
+    """
+    checks whether primes of a given size can be searched for with sieved windows.
+
+    :param bits: the amount of bits in the number
+    :type bits: int
+    :return: False for numbers small enough to be one of the sieving primes themselves, True otherwise
+    :rtype: bool
+    """
+
+    return bits > get_prime_table(get_small_prime_count(bits))[0][-1].bit_length() + 1
+
+
+def has_numpy():
+    """
+    checks if NumPy can be used, running its deferred import on the first call.
+    an install that fails to import is dropped, so that the pure-Python sieve is used instead.
+
+    :return: True if NumPy is available, False otherwise
+    :rtype: bool
+    """
+
+    global numpy
+    if numpy is not None:
+        try:
+            numpy.ndarray  # the first attribute access runs the deferred import
+        except ImportError:
+            sys.modules.pop('numpy', None)  # the half-imported module
+            numpy = None
+    return numpy is not None
+
+
+# set by get_primes in its worker processes, once enough primes are found, so that running windows stop early
+stop_event = None
+
+
+def init_search_worker(event):
+    """
+    stores get_primes' stop event in a worker process.
+
+    :param event: the event set once enough primes are found
+    :type event: multiprocessing.synchronize.Event
+    """
+
+    global stop_event
+    stop_event = event
+
+
+def search_window(bits, lucas=False, window=SIEVE_WINDOW):
+    """
+    searches a single sieved window of candidates, from a random starting point, for a prime.
+
+    :param bits: the amount of bits in the number
+    :type bits: int
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
+    :param window: the amount of candidates in the window
+    :type window: int
+    :return: the first high probability prime in the window, or None if the window has no prime or was stopped
+    :rtype: int | None
+    """
+
+    count = get_small_prime_count(bits)
+    _, residue_products, _ = get_prime_table(count)
+
+    start = get_random_candidate(bits)
+    if has_numpy():
+        survivors = sieve_window_numpy(start, window, count)
+    else:
+        survivors = sieve_window(start, window, residue_products)
+
+    prime = None
+    scanned = tested = 0  # candidates scanned in the window, and the ones that reached the probabilistic tests
+    for k in survivors:
+        candidate = start + 2 * k
+        if candidate.bit_length() != bits or (stop_event is not None and stop_event.is_set()):
+            scanned = k
+            break  # the window overflowed past 'bits' bits, or enough primes were found by other windows
+        scanned, tested = k + 1, tested + 1
+        # candidate has passed low-level check, only survivors reach the probabilistic tests
+        if check_high_level_prime(candidate, lucas):
+            prime = candidate
+            break
+    else:
+        scanned = window
+
+    if stats is not None:
+        stats.windows += 1
+        stats.candidates += scanned
+        stats.low_level_rejected += scanned - tested
+
+    return prime
+
+
+def search_window_seeded(bits, seed, lucas=False, collect=False):
+    """
+    searches a single window for a prime in a worker process.
+    every task reseeds the worker's generator, so that forked workers don't repeat each other's candidates.
+
+    :param bits: the amount of bits in the number
+    :type bits: int
+    :param seed: the seed for the worker's random generator, drawn by the parent process
+    :type seed: int
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
+    :param collect: True to collect the window's PrimeStats, for the parent process to merge
+    :type collect: bool
+    :return: the first high probability prime in the window or None if the window has no prime,
+             and the window's counters or None if not collected
+    :rtype: tuple[int | None, PrimeStats | None]
+    """
+
+    random.seed(seed)
+    if collect is False:
+        return search_window(bits, lucas), None
+
+    with collect_stats() as window_stats:
+        prime = search_window(bits, lucas)
+    return prime, window_stats
+
+
+def get_primes(bits, count, jobs=None, lucas=False):
+    """
+    generates 'count' distinct high probability primes of n bits, searching windows in a process pool.
+    as soon as enough primes are found, the queued windows are cancelled and the running ones are stopped,
+    so no worker process is left running once it returns.
+
+    :param bits: the amount of bits in each number
+    :type bits: int
+    :param count: the amount of primes to generate
+    :type count: int
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 searches in this process
+    :type jobs: int | None
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
+    :return: the high probability prime numbers
+    :rtype: list[int]
+    """
+
+    # only needed with worker processes
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    primes = []
+
+    # small numbers may be one of the sieving primes themselves, which a window never returns:
+    # they are searched one by one in this process instead
+    if jobs == 1 or is_window_searchable(bits) is False:
+        while len(primes) < count:
+            prime = get_prime(bits, lucas=lucas)
+            if prime not in primes:
+                primes.append(prime)
+        return primes
+
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_search_worker,
+                                   initargs=(stop,))
+    try:
+        # keeping two windows queued per worker, so no worker waits for the parent between windows
+        queued = 2 * workers
+        collect = stats is not None  # the workers' counters are merged into this process' ones
+        pending = {executor.submit(search_window_seeded, bits, random.getrandbits(256), lucas, collect)
+                   for _ in range(queued)}
+        while len(primes) < count:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime, window_stats = future.result()
+                if window_stats is not None and stats is not None:
+                    stats.merge(window_stats)
+                if prime is not None and prime not in primes and len(primes) < count:
+                    primes.append(prime)
+            while len(pending) < queued:
+                pending.add(executor.submit(search_window_seeded, bits, random.getrandbits(256), lucas, collect))
+    finally:
+        # the queued windows never start, and the running ones return at their next candidate
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return primes
+
+
+def get_prime(bits, jobs=1, lucas=False):
     """
     generates a high probability prime number of n bits
 
     :param bits: the amount of bits in the number
     :type bits: int
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 searches in this process
+    :type jobs: int | None
+    :param lucas: True to run the Baillie-PSW test, instead of the adaptive Miller-Rabin rounds
+    :type lucas: bool
     :return: the high probability prime number.
     :rtype: int
     """
 
-    candidate = random.getrandbits(bits)
-    while check_prime(candidate) is False:
+    if jobs != 1:
+        return get_primes(bits, 1, jobs, lucas)[0]
+
+    # small numbers may be one of the sieving primes themselves, so they are checked one by one
+    if is_window_searchable(bits) is False:
         candidate = random.getrandbits(bits)
+        while check_prime(candidate, lucas) is False:
+            candidate = random.getrandbits(bits)
+        return candidate
+
+    prime = search_window(bits, lucas)
+    while prime is None:
+        prime = search_window(bits, lucas)
 
-    return candidate
+    return prime
@@ -0,0 +1,206 @@
+import hashlib
+import hmac
+import io
+import os
+import struct
+import rsa
+
+# hybrid format: header, wrapped session key, then segments of encrypted data, each followed by its tag
+# header: magic, format version, wrapped key width in bytes
+MAGIC = b'RSAH'
+VERSION = 1
+HEADER = struct.Struct('>4sBI')
+
+SEGMENT_SIZE = 1 << 20  # plain bytes per segment, bounds the memory used by the streaming functions
+TAG_SIZE = 32  # HMAC-SHA256
+
+
+def derive_keys(secret):
+    """
+    derives the symmetric keys from the RSA-KEM secret.
+
+    :param secret: the random secret wrapped with RSA, as big-endian bytes
+    :type secret: bytes
+    :return: the stream cipher key and the authentication key
+    :rtype: tuple[bytes, bytes]
+    """
+
+    material = hashlib.shake_256(b'RSA-KEM' + secret).digest(64)
+    return material[:32], material[32:]
+
+
+def xor_segment(enc_key, index, data):
+    """
+    encrypts or decrypts a single segment, by XOR with a SHAKE-256 keystream.
+    the XOR is done on whole ints, so the per-byte work runs in C.
+
+    :param enc_key: the stream cipher key
+    :type enc_key: bytes
+    :param index: the segment's index, every segment gets an independent keystream
+    :type index: int
+    :param data: the segment's bytes
+    :type data: bytes
+    :return: the XOR-ed bytes
+    :rtype: bytes
+    """
+
+    keystream = hashlib.shake_256(enc_key + index.to_bytes(8, byteorder='big')).digest(len(data))
+    result = int.from_bytes(data, byteorder='big') ^ int.from_bytes(keystream, byteorder='big')
+    return result.to_bytes(len(data), byteorder='big')
+
+
+def segment_tag(mac_key, header, index, final, ciphertext):
+    """
+    computes the authentication tag of a single segment.
+    the index and the final flag are authenticated too, so segments can't be reordered or truncated.
+
+    :param mac_key: the authentication key
+    :type mac_key: bytes
+    :param header: the message's header and wrapped key
+    :type header: bytes
+    :param index: the segment's index
+    :type index: int
+    :param final: True for the last segment of the message
+    :type final: bool
+    :param ciphertext: the segment's encrypted bytes
+    :type ciphertext: bytes
+    :return: the tag
+    :rtype: bytes
+    """
+
+    mac = hmac.new(mac_key, header, hashlib.sha256)
+    mac.update(index.to_bytes(8, byteorder='big') + (b'\x01' if final else b'\x00'))
+    mac.update(ciphertext)
+    return mac.digest()
+
+
+def encrypt_stream(in_file, out_file, pub_key):
+    """
+    encrypts a binary file object with RSA-KEM and a symmetric stream cipher, with bounded memory.
+    RSA wraps only a random session secret, so the cost is a single exponentiation regardless of the size.
+
+    :param in_file: binary file object to read the plain bytes from
+    :type in_file: typing.BinaryIO
+    :param out_file: binary file object to write the hybrid message to
+    :type out_file: typing.BinaryIO
+    :param pub_key: recipient's public key (n, e)
+    :type pub_key: tuple[int]
+    :return: the amount of plain bytes encrypted
+    :rtype: int
+    """
+
+    n = pub_key[0]
+    width = (n.bit_length() + 7) // 8
+
+    # RSA-KEM: a random secret in [2, n - 2], wrapped with the recipient's public key
+    secret = int.from_bytes(os.urandom(width + 8), byteorder='big') % (n - 3) + 2
+    wrapped = rsa.num_encryption(secret, pub_key)
+    enc_key, mac_key = derive_keys(secret.to_bytes(width, byteorder='big'))
+
+    header = HEADER.pack(MAGIC, VERSION, width) + wrapped.to_bytes(width, byteorder='big')
+    out_file.write(header)
+
+    # reading a segment ahead, to know which segment is the final one
+    total = index = 0
+    segment = in_file.read(SEGMENT_SIZE)
+    while True:
+        next_segment = in_file.read(SEGMENT_SIZE) if len(segment) == SEGMENT_SIZE else b''
+        final = not next_segment
+
+        ciphertext = xor_segment(enc_key, index, segment)
+        out_file.write(ciphertext)
+        out_file.write(segment_tag(mac_key, header, index, final, ciphertext))
+
+        total += len(segment)
+        if final:
+            return total
+        segment, index = next_segment, index + 1
+
+
+def decrypt_stream(in_file, out_file, private_key):
+    """
+    decrypts a binary file object written by encrypt_stream, with bounded memory.
+    every segment is authenticated before its plain bytes are written.
+
+    :param in_file: binary file object to read the hybrid message from
+    :type in_file: typing.BinaryIO
+    :param out_file: binary file object to write the plain bytes to
+    :type out_file: typing.BinaryIO
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int]
+    :return: the amount of plain bytes decrypted
+    :rtype: int
+    """
+
+    n = private_key[0]
+
+    header = in_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Hybrid message is too short for a header")
+    magic, version, width = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a hybrid message")
+    if version != VERSION:
+        raise ValueError(f"Unsupported hybrid message version: {version}")
+    if width != (n.bit_length() + 7) // 8:
+        raise ValueError("Hybrid message was encrypted under a different modulus")
+
+    wrapped_bytes = in_file.read(width)
+    if len(wrapped_bytes) < width:
+        raise ValueError("Hybrid message is truncated")
+    header += wrapped_bytes
+
+    secret = rsa.num_decryption(int.from_bytes(wrapped_bytes, byteorder='big'), private_key)
+    enc_key, mac_key = derive_keys(secret.to_bytes(width, byteorder='big'))
+
+    total = index = 0
+    chunk = in_file.read(SEGMENT_SIZE + TAG_SIZE)
+    while True:
+        if len(chunk) < TAG_SIZE:
+            raise ValueError("Hybrid message is truncated")
+        next_chunk = in_file.read(SEGMENT_SIZE + TAG_SIZE) if len(chunk) == SEGMENT_SIZE + TAG_SIZE else b''
+        final = not next_chunk
+
+        ciphertext, tag = chunk[:-TAG_SIZE], chunk[-TAG_SIZE:]
+        if not hmac.compare_digest(tag, segment_tag(mac_key, header, index, final, ciphertext)):
+            raise ValueError("Hybrid message authentication failed")
+        out_file.write(xor_segment(enc_key, index, ciphertext))
+
+        total += len(ciphertext)
+        if final:
+            return total
+        chunk, index = next_chunk, index + 1
+
+
+def encrypt(data, pub_key):
+    """
+    encrypts bytes with RSA-KEM and a symmetric stream cipher.
+
+    :param data: the plain bytes
+    :type data: bytes
+    :param pub_key: recipient's public key (n, e)
+    :type pub_key: tuple[int]
+    :return: the hybrid message
+    :rtype: bytes
+    """
+
+    out_file = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), out_file, pub_key)
+    return out_file.getvalue()
+
+
+def decrypt(message, private_key):
+    """
+    decrypts a hybrid message written by encrypt or encrypt_stream.
+
+    :param message: the hybrid message
+    :type message: bytes
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int]
+    :return: the plain bytes
+    :rtype: bytes
+    """
+
+    out_file = io.BytesIO()
+    decrypt_stream(io.BytesIO(message), out_file, private_key)
+    return out_file.getvalue()
@@ -0,0 +1,168 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import keyfile
+import rsa
+
+# file name of a persisted key pair: <key size>-<index>.key, in the binary key file format
+KEY_FILE_SUFFIX = '.key'
+
+
+def generate_key_pair(key_size):
+    """
+    generates a key pair in a pool worker, searching for both primes in the worker itself.
+
+    :param key_size: the size of the modulus in bits
+    :type key_size: int
+    :return: the public key (n, e) and the private key (n, d, p, q, dP, dQ, qInv)
+    :rtype: tuple[tuple[int]]
+    """
+
+    return rsa.generate_keys(key_size, 1)
+
+
+class KeyPool:
+    """
+    bounded pool of pre-generated key pairs per key size, refilled by background worker processes.
+    once a size's queue drops to the low-water mark, it is refilled up to its capacity, so taking a key pair
+    is a dequeue instead of a prime search. every key pair is handed out once, and is never persisted again.
+    """
+
+    def __init__(self, sizes=(2048,), capacity=4, low_water=2, workers=1, path=None):
+        """
+        :param sizes: the key sizes to keep key pairs of, in bits
+        :type sizes: list[int]
+        :param capacity: the maximal amount of key pairs kept per size
+        :type capacity: int
+        :param low_water: the amount of key pairs per size at which the size is refilled, 0 refills it once empty
+        :type low_water: int
+        :param workers: the amount of worker processes generating key pairs
+        :type workers: int
+        :param path: optional directory to persist the key pairs in across restarts, loaded here and saved by close
+        :type path: str | None
+        """
+
+        if not 0 <= low_water <= capacity:
+            raise ValueError("Low-water mark must be between 0 and the capacity")
+
+        self.capacity = capacity
+        self.low_water = low_water
+        self.path = path
+        self.queues = {key_size: deque() for key_size in sizes}
+        self.pending = {key_size: 0 for key_size in sizes}  # key pairs being generated, per size
+        self.closed = False
+        self.available = threading.Condition(threading.RLock())
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+        if path is not None:
+            self.load()
+        with self.available:
+            for key_size in self.queues:
+                self.refill(key_size)
+
+    def load(self):
+        """
+        loads the persisted key pairs of the pool's sizes, deleting their files so they are never handed out twice.
+        """
+
+        if os.path.isdir(self.path) is False:
+            return
+
+        for name in sorted(os.listdir(self.path)):
+            key_size = name.split('-')[0]
+            if name.endswith(KEY_FILE_SUFFIX) is False or key_size.isdigit() is False:
+                continue
+            key_size = int(key_size)
+            file_path = os.path.join(self.path, name)
+            if key_size in self.queues and len(self.queues[key_size]) < self.capacity:
+                public, private = keyfile.load_keys(file_path)
+                self.queues[key_size].append((tuple(public), tuple(private)))
+                os.remove(file_path)
+
+    def save(self):
+        """
+        persists the queued key pairs into the pool's directory.
+        """
+
+        os.makedirs(self.path, mode=0o700, exist_ok=True)  # the key files hold private keys
+        with self.available:
+            for key_size, queue in self.queues.items():
+                for i, (public, private) in enumerate(queue):
+                    keyfile.save_binary_keys(os.path.join(self.path, f'{key_size}-{i}{KEY_FILE_SUFFIX}'),
+                                             public, private)
+
+    def refill(self, key_size):
+        """
+        submits key pairs to the workers, until the queued and the pending ones reach the capacity.
+        called with the lock held.
+
+        :param key_size: the size of the modulus in bits
+        :type key_size: int
+        """
+
+        while not self.closed and len(self.queues[key_size]) + self.pending[key_size] < self.capacity:
+            self.pending[key_size] += 1
+            future = self.executor.submit(generate_key_pair, key_size)
+            future.add_done_callback(lambda f, key_size=key_size: self.on_generated(key_size, f))
+
+    def on_generated(self, key_size, future):
+        """
+        queues a key pair generated by a worker.
+
+        :param key_size: the size of the modulus in bits
+        :type key_size: int
+        :param future: the worker's future
+        :type future: concurrent.futures.Future
+        """
+
+        with self.available:
+            self.pending[key_size] -= 1
+            if not future.cancelled() and future.exception() is None and not self.closed:
+                self.queues[key_size].append(future.result())
+            self.available.notify_all()
+
+    def get(self, key_size, timeout=None):
+        """
+        takes a key pair out of the pool.
+        with the queue empty, waits for a key pair being generated, or generates one here if none is.
+
+        :param key_size: the size of the modulus in bits
+        :type key_size: int
+        :param timeout: the maximal time to wait for a key pair being generated, in seconds. None waits forever
+        :type timeout: float | None
+        :return: the public key (n, e) and the private key (n, d, p, q, dP, dQ, qInv)
+        :rtype: tuple[tuple[int]]
+        """
+
+        if key_size not in self.queues:
+            raise ValueError(f"Key size {key_size} isn't kept by the pool")
+
+        with self.available:
+            queue = self.queues[key_size]
+            self.available.wait_for(lambda: queue or not self.pending[key_size], timeout)
+            key_pair = queue.popleft() if queue else None
+            if len(queue) <= self.low_water:
+                self.refill(key_size)
+
+        if key_pair is None:
+            # the workers failed, or the wait timed out
+            key_pair = rsa.generate_keys(key_size)
+        return key_pair
+
+    def close(self):
+        """
+        stops the workers, persisting the queued key pairs if the pool has a directory.
+        """
+
+        with self.available:
+            self.closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.path is not None:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
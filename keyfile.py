@@ -0,0 +1,290 @@
+import hashlib
+import os
+import re
+import struct
+from datetime import datetime
+import keys
+import my_utilities
+
+# private key fields, in the order of the private key tuple (n, d, p, q, dP, dQ, qInv)
+PRIVATE_FIELDS = [('Modulus', 'n'), ('Private Exponent', 'd'), ('Prime 1', 'p'), ('Prime 2', 'q'),
+                  ('Exponent 1', 'dP'), ('Exponent 2', 'dQ'), ('Coefficient', 'qInv')]
+
+# most primes a multi-prime key in a key file can have
+MAX_PRIMES = 8
+# fields of the additional primes of a multi-prime key, following the private key fields in the same order
+OTHER_PRIME_FIELDS = [field for i in range(3, MAX_PRIMES + 1)
+                      for field in ((f'Prime {i}', f'r{i}'), (f'Exponent {i}', f'd{i}'),
+                                    (f'Coefficient {i}', f't{i}'))]
+
+# a key line: '- <name> (<field>): <value>'
+FIELD_LINE = re.compile(r'-\s*[^(]*\((\w+)\):\s*(\d+)')
+
+# binary format: header, then the fields as raw big-endian bytes, each after its tag and length
+# header: magic, format version, amount of fields
+MAGIC = b'RSAK'
+VERSION = 1
+HEADER = struct.Struct('>4sBB')
+FIELD_HEADER = struct.Struct('>BI')
+FIELD_TAGS = {'n': 1, 'e': 2, 'd': 3, 'p': 4, 'q': 5, 'dP': 6, 'dQ': 7, 'qInv': 8}
+FIELD_TAGS.update((field, 9 + i) for i, (_, field) in enumerate(OTHER_PRIME_FIELDS))
+
+
+def get_private_key(fields):
+    """
+    builds a private key out of the fields found in a key file.
+
+    :param fields: the fields found, by name
+    :type fields: dict
+    :return: the private key (n, d, p, q, dP, dQ, qInv), followed by (r, d, t) of every additional prime,
+             or (n, d) when the CRT parameters are missing
+    :rtype: tuple[int]
+    """
+
+    if not all(field in fields for _, field in PRIVATE_FIELDS):
+        return fields['n'], fields['d']  # legacy key, without the CRT parameters
+
+    private_key = tuple(fields[field] for _, field in PRIVATE_FIELDS)
+    for i in range(0, len(OTHER_PRIME_FIELDS), 3):
+        prime_fields = [field for _, field in OTHER_PRIME_FIELDS[i:i + 3]]
+        if not all(field in fields for field in prime_fields):
+            break
+        private_key += tuple(fields[field] for field in prime_fields)
+    return private_key
+
+
+def open_key_file(path, mode, private):
+    """
+    opens a key file for writing. a file holding a private key is readable and writable by its owner only,
+    from its creation on.
+
+    :param path: the key file's path
+    :type path: str
+    :param mode: 'w' for a text key file, 'wb' for a binary one
+    :type mode: str
+    :param private: True if the file holds a private key
+    :type private: bool
+    :return: the file object
+    :rtype: typing.IO
+    """
+
+    if not private:
+        return open(path, mode)
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o600)  # an existing file keeps its mode otherwise
+    return os.fdopen(fd, mode)
+
+
+def save_keys(path, public_key, private_key=None):
+    """
+    saves keys into a text key file, the format the key generation has always saved.
+
+    :param path: the key file's path
+    :type path: str
+    :param public_key: the public key (n, e)
+    :type public_key: tuple[int]
+    :param private_key: the private key (n, d, p, q, dP, dQ, qInv, ...) or (n, d). None saves only the public key
+    :type private_key: tuple[int] | None
+    """
+
+    with open_key_file(path, 'w', private_key is not None) as f:
+        now = datetime.now()
+        f.write(f'RSA Keys: {now.strftime("%d/%m/%Y %H:%M:%S")}:')
+        n, e = (my_utilities.int_to_decimal(value) for value in public_key)
+        f.write(f"\n\tRSA Public Key:\n\t\t- Modulus (n): {n}\n\t\t- Public Exponent (e): {e}\n")
+        if private_key is not None:
+            f.write("\n\tRSA Private Key:\n")
+            for (name, field), value in zip(PRIVATE_FIELDS + OTHER_PRIME_FIELDS, private_key):
+                f.write(f"\t\t- {name} ({field}): {my_utilities.int_to_decimal(value)}\n")
+
+
+def load_text_keys(path):
+    """
+    loads the keys saved in a text key file.
+
+    :param path: the key file's path
+    :type path: str
+    :return: the public key (n, e) and the private key (n, d, p, q, dP, dQ, qInv, ...) or (n, d).
+             a key is None when the file doesn't hold it
+    :rtype: tuple[tuple[int] | None, tuple[int] | None]
+    """
+
+    fields = {}
+    with open(path, 'r') as f:
+        for line in f:
+            match = FIELD_LINE.search(line)
+            if match is not None:
+                fields[match.group(1)] = my_utilities.int_from_decimal(match.group(2))
+
+    if 'n' not in fields:
+        raise ValueError("Key file has no modulus")
+
+    public_key = (fields['n'], fields['e']) if 'e' in fields else None
+
+    private_key = get_private_key(fields) if 'd' in fields else None
+
+    return public_key, private_key
+
+
+def save_binary_keys(path, public_key, private_key=None):
+    """
+    saves keys into a binary key file, storing every field as raw big-endian bytes.
+
+    :param path: the key file's path
+    :type path: str
+    :param public_key: the public key (n, e)
+    :type public_key: tuple[int]
+    :param private_key: the private key (n, d, p, q, dP, dQ, qInv, ...) or (n, d). None saves only the public key
+    :type private_key: tuple[int] | None
+    """
+
+    fields = {'n': public_key[0], 'e': public_key[1]}
+    if private_key is not None:
+        private_fields = PRIVATE_FIELDS + OTHER_PRIME_FIELDS
+        fields.update((field, value) for (_, field), value in zip(private_fields[1:], private_key[1:]))
+
+    with open_key_file(path, 'wb', private_key is not None) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(fields)))
+        for field, value in fields.items():
+            raw = value.to_bytes((value.bit_length() + 7) // 8, byteorder='big')
+            f.write(FIELD_HEADER.pack(FIELD_TAGS[field], len(raw)))
+            f.write(raw)
+
+
+class KeyFile:
+    """
+    binary key file, parsed lazily.
+    loading only indexes where each field lies, every field is converted to an int on its first use.
+    """
+
+    __slots__ = ('path', 'data', 'offsets', 'values')
+
+    def __init__(self, path):
+        """
+        reads and indexes a binary key file.
+
+        :param path: the key file's path
+        :type path: str
+        """
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        self.offsets = {}  # field: (offset, length) of its raw bytes
+        self.values = {}  # field: int, for the fields already converted
+
+        if len(self.data) < HEADER.size:
+            raise ValueError("Key file is too short for a header")
+        magic, version, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError("Not a binary key file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported key file version: {version}")
+
+        names = {tag: field for field, tag in FIELD_TAGS.items()}
+        offset = HEADER.size
+        for _ in range(count):
+            if offset + FIELD_HEADER.size > len(self.data):
+                raise ValueError("Key file is truncated")
+            tag, length = FIELD_HEADER.unpack_from(self.data, offset)
+            offset += FIELD_HEADER.size
+            if offset + length > len(self.data):
+                raise ValueError("Key file is truncated")
+            if tag in names:  # unknown tags are skipped, for forward compatibility
+                self.offsets[names[tag]] = (offset, length)
+            offset += length
+
+        if 'n' not in self.offsets:
+            raise ValueError("Key file has no modulus")
+
+    def raw(self, field):
+        """
+        :param field: the field's name, such as 'n' or 'qInv'
+        :type field: str
+        :return: the field's raw big-endian bytes, without converting them
+        :rtype: memoryview
+        """
+
+        offset, length = self.offsets[field]
+        return memoryview(self.data)[offset:offset + length]
+
+    def get(self, field):
+        """
+        :param field: the field's name, such as 'n' or 'qInv'
+        :type field: str
+        :return: the field's value, converted on the first use
+        :rtype: int
+        """
+
+        if field not in self.values:
+            self.values[field] = int.from_bytes(self.raw(field), byteorder='big')
+        return self.values[field]
+
+    @property
+    def fingerprint(self):
+        """
+        :return: the modulus fingerprint, computed straight from the raw bytes (see my_utilities.fingerprint)
+        :rtype: bytes
+        """
+
+        return hashlib.sha256(self.raw('n')).digest()
+
+    @property
+    def has_private_key(self):
+        return 'd' in self.offsets
+
+    def public_key(self):
+        """
+        :return: the key file's public key
+        :rtype: keys.PublicKey
+        """
+
+        if 'e' not in self.offsets:
+            raise ValueError("Key file has no public key")
+        return keys.get_public_key((self.get('n'), self.get('e')))
+
+    def private_key(self):
+        """
+        :return: the key file's private key, a legacy one if the CRT parameters are missing
+        :rtype: keys.PrivateKey
+        """
+
+        if not self.has_private_key:
+            raise ValueError("Key file has no private key")
+        return keys.get_private_key(get_private_key({field: self.get(field) for field in self.offsets}))
+
+
+def is_binary_key_file(path):
+    """
+    checks whether a key file is a binary one.
+
+    :param path: the key file's path
+    :type path: str
+    :return: True if the file starts with the binary key file magic, False otherwise
+    :rtype: bool
+    """
+
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_keys(path):
+    """
+    loads the keys saved in a key file, binary or text.
+
+    :param path: the key file's path
+    :type path: str
+    :return: the public key (n, e) and the private key (n, d, p, q, dP, dQ, qInv, ...) or (n, d).
+             a key is None when the file doesn't hold it
+    :rtype: tuple[tuple[int] | keys.PublicKey | None, tuple[int] | keys.PrivateKey | None]
+    """
+
+    if is_binary_key_file(path) is False:
+        return load_text_keys(path)
+
+    key_file = KeyFile(path)
+    public_key = key_file.public_key() if 'e' in key_file.offsets else None
+    private_key = key_file.private_key() if key_file.has_private_key else None
+    return public_key, private_key
@@ -0,0 +1,211 @@
+import math
+from collections import OrderedDict
+import my_utilities
+
+# amount of keys kept by the registry, the least recently used key is evicted first
+KEY_CACHE_SIZE = 64
+
+
+class PublicKey:
+    """
+    RSA public key (n, e), with the per-modulus values precomputed once.
+    it unpacks and indexes like the (n, e) tuple, so it can be passed wherever a tuple key is expected.
+    """
+
+    __slots__ = ('n', 'e', 'byte_length', 'block_size', 'fingerprint', 'context')
+
+    def __init__(self, n, e):
+        """
+        :param n: the modulus
+        :type n: int
+        :param e: the public exponent
+        :type e: int
+        """
+
+        self.n = n
+        self.e = e
+        self.byte_length = (n.bit_length() + 7) // 8  # width of an encrypted block
+        self.block_size = self.byte_length - 1  # padded blocks are one byte shorter, so they are smaller than n
+        self.fingerprint = my_utilities.fingerprint(n)
+        self.context = my_utilities.ModContext(n)
+
+    def as_tuple(self):
+        """
+        :return: the key as a tuple (n, e)
+        :rtype: tuple[int]
+        """
+
+        return self.n, self.e
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, i):
+        return self.as_tuple()[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, PublicKey, PrivateKey)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f'PublicKey(n=<{self.n.bit_length()} bits>, e={self.e})'
+
+
+class PrivateKey:
+    """
+    RSA private key (n, d, p, q, dP, dQ, qInv), followed by (r, d, t) of every additional prime of a multi-prime key,
+    or a legacy (n, d) key, with the per-modulus values precomputed once.
+    it unpacks and indexes like the tuple it was built from, so it can be passed wherever a tuple key is expected.
+    """
+
+    __slots__ = ('n', 'd', 'crt', 'byte_length', 'block_size', 'fingerprint', 'secret_fingerprint', 'contexts', 'e')
+
+    def __init__(self, n, d, *crt):
+        """
+        :param n: the modulus
+        :type n: int
+        :param d: the private exponent
+        :type d: int
+        :param crt: the CRT parameters p, q, dP, dQ, qInv, then r, d, t of every additional prime.
+                    empty for a legacy key
+        :type crt: int
+        """
+
+        self.n = n
+        self.d = d
+        self.crt = crt
+        self.byte_length = (n.bit_length() + 7) // 8
+        self.block_size = self.byte_length - 1
+        self.fingerprint = my_utilities.fingerprint(n)
+        # fingerprint of the modulus and the private exponent, telling apart keys that only share n
+        self.secret_fingerprint = my_utilities.fingerprint(n, d)
+        # arithmetic contexts of the primes p, q, r..., or of n for a legacy key
+        moduli = crt[:2] + crt[5::3] if crt else (n,)
+        self.contexts = tuple(my_utilities.ModContext(modulus) for modulus in moduli)
+        self.e = None  # the public exponent, recovered on first use by public_exponent
+
+    def as_tuple(self):
+        """
+        :return: the key as a tuple (n, d, p, q, dP, dQ, qInv, ...), or (n, d) for a legacy key
+        :rtype: tuple[int]
+        """
+
+        return (self.n, self.d) + self.crt
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __len__(self):
+        return 2 + len(self.crt)
+
+    def __getitem__(self, i):
+        return self.as_tuple()[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, PublicKey, PrivateKey)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    @property
+    def primes(self):
+        """
+        :return: the amount of primes of the key, 0 for a legacy key
+        :rtype: int
+        """
+
+        return 2 + (len(self.crt) - 5) // 3 if self.crt else 0
+
+    @property
+    def public_exponent(self):
+        """
+        :return: the public exponent, recovered from d and the primes (d * e = 1 mod lcm(p - 1, q - 1, ...)).
+                 None for a legacy key, whose primes are unknown
+        :rtype: int | None
+        """
+
+        if self.e is None and self.crt:
+            carmichael = 1
+            for prime in self.crt[:2] + self.crt[5::3]:
+                carmichael = math.lcm(carmichael, prime - 1)
+            self.e = my_utilities.mod_inverse(self.d % carmichael, carmichael)
+        return self.e
+
+    def __repr__(self):
+        return f'PrivateKey(n=<{self.n.bit_length()} bits>, crt={bool(self.crt)}, primes={self.primes})'
+
+
+# LRU registry of key objects, by kind and modulus
+registry = OrderedDict()
+
+
+def get_key(cls, key):
+    """
+    gets the cached key object of a given key, building and registering it on the first use.
+
+    :param cls: PublicKey or PrivateKey
+    :type cls: type
+    :param key: the key, as a tuple or as a key object
+    :type key: tuple[int] | PublicKey | PrivateKey
+    :return: the key object
+    :rtype: PublicKey | PrivateKey
+    """
+
+    if isinstance(key, cls):
+        return key
+
+    key = tuple(key)
+    entry = (cls, key[0])
+    cached = registry.get(entry)
+    if cached is not None and cached.as_tuple() == key:
+        registry.move_to_end(entry)
+        return cached
+
+    cached = registry[entry] = cls(*key)
+    registry.move_to_end(entry)
+    if len(registry) > KEY_CACHE_SIZE:
+        registry.popitem(last=False)
+    return cached
+
+
+def get_public_key(key):
+    """
+    gets the cached PublicKey of a given public key.
+
+    :param key: the public key (n, e), as a tuple or as a PublicKey
+    :type key: tuple[int] | PublicKey
+    :return: the key object
+    :rtype: PublicKey
+    """
+
+    return get_key(PublicKey, key)
+
+
+def get_private_key(key):
+    """
+    gets the cached PrivateKey of a given private key.
+
+    :param key: the private key (n, d, p, q, dP, dQ, qInv) or (n, d), as a tuple or as a PrivateKey
+    :type key: tuple[int] | PrivateKey
+    :return: the key object
+    :rtype: PrivateKey
+    """
+
+    return get_key(PrivateKey, key)
+
+
+def clear_registry():
+    """
+    removes all the keys from the registry.
+    """
+
+    registry.clear()
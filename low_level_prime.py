@@ -1,3 +1,48 @@
+import array
+import math
+import mmap
+import os
+import struct
+import sys
+
+# products of consecutive small primes are kept under these sizes:
+# a few machine words for computing residues, so that each residue costs a single word-size modulo
+RESIDUE_PRODUCT_BITS = 240
+# about a candidate's size for trial division, so that a whole group of primes costs a single modulo and gcd
+TRIAL_PRODUCT_BITS = 2048
+
+# precomputed table file: header, the primes as little-endian uint32, then each set of products
+# header: magic, format version, RESIDUE_PRODUCT_BITS and TRIAL_PRODUCT_BITS the products were built with,
+# amount of primes, amount of residue products, amount of trial products
+# a set of products: the index of its first prime, the size of each group and the byte length of each product,
+# all as uint32, then the products as little-endian bytes
+TABLE_MAGIC = b'RSAP'
+TABLE_VERSION = 2
+TABLE_HEADER = struct.Struct('<4sBIIIII')
+
+
+def get_primes_below(limit):
+    """
+    computes all the primes below a limit, using the sieve of Eratosthenes.
+
+    :param limit: the limit, not included
+    :type limit: int
+    :return: the list of the primes below limit
+    :rtype: list[int]
+    """
+
+    if limit < 3:
+        return []
+
+    sieve = bytearray(b'\x01') * limit
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))  # crossing out the multiples of i
+
+    return [i for i, is_prime in enumerate(sieve) if is_prime]
+
+
 def get_n_primes(N):
     """
     computes the first N primes.
@@ -8,17 +53,156 @@ def get_n_primes(N):
     :rtype: list[int]
     """
 
-    primes = [2]
-    cur = 3
-    while len(primes) < N:
-        for i in range(len(primes)):
-            if cur % primes[i] == 0:
-                break
-        else:
-            primes.append(cur)
-        cur += 2
+    # the N-th prime is below N * (ln N + ln ln N), for N >= 6
+    limit = 15 if N < 6 else int(N * (math.log(N) + math.log(math.log(N)))) + 1
+
+    return get_primes_below(limit)[:N]
+
+
+def get_prime_products(primes, max_bits):
+    """
+    groups consecutive primes, so that the product of each group stays under max_bits bits.
+
+    :param primes: the primes
+    :type primes: list[int]
+    :param max_bits: the maximal size of a product, in bits. a single larger prime gets a group of its own
+    :type max_bits: int
+    :return: list of (product, primes in the product)
+    :rtype: list[tuple[int, list[int]]]
+    """
+
+    groups = []
+    product, group = 1, []
+    for prime in primes:
+        if group and (product * prime).bit_length() > max_bits:
+            groups.append((product, group))
+            product, group = 1, []
+        product *= prime
+        group.append(prime)
+    if group:
+        groups.append((product, group))
+
+    return groups
+
+
+def get_residues(number, products):
+    """
+    computes the residues of a number modulo each small prime.
+    the number is reduced once per product, and each residue is then a word-size modulo.
+
+    :param number: the number
+    :type number: int
+    :param products: the primes grouped by get_prime_products, preferably with RESIDUE_PRODUCT_BITS
+    :type products: list[tuple[int, list[int]]]
+    :return: the residues, in the order of the primes
+    :rtype: list[int]
+    """
+
+    return [r % prime for product, group in products for r in (number % product,) for prime in group]
+
+
+def check_coprime(number, products):
+    """
+    checks that a number isn't divisible by any of the small primes.
+    each group of primes costs a single modulo and gcd, instead of a modulo per prime.
+
+    :param number: the number
+    :type number: int
+    :param products: the primes grouped by get_prime_products, preferably with TRIAL_PRODUCT_BITS
+    :type products: list[tuple[int, list[int]]]
+    :return: True if the number isn't divisible by any of the primes, False otherwise
+    :rtype: bool
+    """
+
+    for product, _ in products:
+        if math.gcd(number % product, product) != 1:
+            return False
+    return True
+
+
+def save_prime_table(path, primes, residue_products, trial_products):
+    """
+    saves a table of small primes and their products into a compact binary file, so it doesn't have to be rebuilt.
+    the file is written to a temporary path first, so that readers never see a partial table.
+
+    :param path: the table file's path
+    :type path: str
+    :param primes: the primes
+    :type primes: list[int]
+    :param residue_products: the primes grouped by get_prime_products, with RESIDUE_PRODUCT_BITS
+    :type residue_products: list[tuple[int, list[int]]]
+    :param trial_products: the primes grouped by get_prime_products, with TRIAL_PRODUCT_BITS
+    :type trial_products: list[tuple[int, list[int]]]
+    """
+
+    def to_le(values):
+        words = array.array('I', values)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        return words.tobytes()
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, RESIDUE_PRODUCT_BITS, TRIAL_PRODUCT_BITS,
+                                  len(primes), len(residue_products), len(trial_products)))
+        f.write(to_le(primes))
+        for products in (residue_products, trial_products):
+            raw = [product.to_bytes((product.bit_length() + 7) // 8, byteorder='little') for product, _ in products]
+            f.write(to_le([primes.index(products[0][1][0]) if products else 0]))
+            f.write(to_le([len(group) for _, group in products]))
+            f.write(to_le([len(product) for product in raw]))
+            f.write(b''.join(raw))
+    os.replace(temp_path, path)
+
+
+def load_prime_table(path):
+    """
+    loads a table saved by save_prime_table, through a memory mapping of the file.
+    a table whose products were built with other RESIDUE_PRODUCT_BITS or TRIAL_PRODUCT_BITS is refused as stale.
+
+    :param path: the table file's path
+    :type path: str
+    :return: the primes, their products for computing residues, and their products for trial division
+    :rtype: tuple[list[int], list[tuple[int, list[int]]], list[tuple[int, list[int]]]]
+    """
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < TABLE_HEADER.size:
+            raise ValueError("Prime table file is too short for a header")
+        magic, version, residue_bits, trial_bits, count, residue_count, trial_count = TABLE_HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError("Not a prime table file")
+        if residue_bits != RESIDUE_PRODUCT_BITS or trial_bits != TRIAL_PRODUCT_BITS:
+            raise ValueError("Prime table file was built with other product sizes")
+
+        offset = TABLE_HEADER.size
+
+        def read_words(amount):
+            nonlocal offset
+            if offset + 4 * amount > len(data):
+                raise ValueError("Prime table file is truncated")
+            words = array.array('I', data[offset:offset + 4 * amount])
+            if sys.byteorder == 'big':
+                words.byteswap()
+            offset += 4 * amount
+            return words.tolist()
+
+        primes = read_words(count)
+        tables = [primes]
+        for amount in (residue_count, trial_count):
+            start, = read_words(1)
+            sizes, lengths = read_words(amount), read_words(amount)
+            if offset + sum(lengths) > len(data) or start + sum(sizes) > count:
+                raise ValueError("Prime table file is truncated")
+            products = []
+            for size, length in zip(sizes, lengths):
+                products.append((int.from_bytes(data[offset:offset + length], byteorder='little'),
+                                 primes[start:start + size]))
+                offset += length
+                start += size
+            tables.append(products)
 
-    return primes
+    return tuple(tables)
 
 
 # generate list:
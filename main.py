@@ -1,12 +1,30 @@
-import generate_prime
-import rsa
+import argparse
+import my_utilities
 import os
+import sys
+from contextlib import contextmanager
 from datetime import datetime
 
+# loaded on first use, so that every run pays only for the modules its command uses
+generate_prime = my_utilities.lazy_import('generate_prime')
+rsa = my_utilities.lazy_import('rsa')
+ciphertext_file = my_utilities.lazy_import('ciphertext_file')
+hybrid = my_utilities.lazy_import('hybrid')
+keyfile = my_utilities.lazy_import('keyfile')
+key_pool = my_utilities.lazy_import('key_pool')
 
-def rsa_key_gen():
+# exit codes of the command line interface
+EXIT_OK = 0
+EXIT_FAILURE = 1  # invalid key, corrupted or mismatched input
+EXIT_USAGE = 2  # invalid arguments, also used by argparse
+EXIT_IO = 3  # missing or unreadable files
+
+
+def rsa_key_gen(pool=None):
     """
     Generates new keys
+    :param pool: optional pool of pre-generated key pairs, taken from instead of generating
+    :type: key_pool.KeyPool | None
     :return: the private and public keys
     :rtype: tuple[tuple[int]]
     """
@@ -18,11 +36,26 @@ def rsa_key_gen():
         print('Invalid option!')
         key_size = input("2048/3072/4096: ")
 
-    # generating keys
+    # getting the amount of primes, bigger keys may be multi-prime ones, which are faster to generate and use
     key_size = int(key_size)
-    print('Generating...')
-    p, q = generate_prime.get_prime(key_size // 2), generate_prime.get_prime(key_size // 2)
-    public, private = rsa.get_keys(p, q)
+    options = [str(primes) for primes in range(2, rsa.max_primes(key_size) + 1)]
+    primes = '2'
+    if len(options) > 1:
+        print("Enter desired amount of primes:")
+        primes = input(f"{'/'.join(options)}: ")
+        while primes not in options:
+            print('Invalid option!')
+            primes = input(f"{'/'.join(options)}: ")
+
+    # generating keys, the pool holds only two-prime keys
+    primes = int(primes)
+    if pool is not None and key_size in pool.queues and primes == 2:
+        public, private = pool.get(key_size)
+    else:
+        print('Generating...')
+        with generate_prime.collect_stats() as stats:
+            public, private = rsa.generate_keys(key_size, primes=primes)  # using all the available cores
+        print(stats.report())
 
     print('\nThe generated keys are:')
     print(f'\tRSA Public Key:\n\t\t- Modulus (n): {public[0]}\n\t\t- Public Exponent (e): {public[1]}\n')
@@ -41,39 +74,35 @@ def rsa_key_gen():
             print("Invalid path!")
             path = input('Please Specify a file path to save keys:')
 
-        with open(path, 'w') as f:
-            now = datetime.now()
-            f.write(f'RSA Keys: {now.strftime("%d/%m/%Y %H:%M:%S")}:')
-            f.write(f"\n\tRSA Public Key:\n\t\t- Modulus (n): {public[0]}\n\t\t- Public Exponent (e): {public[1]}\n")
-            f.write(
-                f"\n\tRSA Private Key:\n\t\t- Modulus (n): {private[0]}\n\t\t- Private Exponent (d): {private[1]}\n")
-            print("Keys have been saved successfully!")
+        keyfile.save_keys(path, public, private)
+        print("Keys have been saved successfully!")
 
     return public, private
 
 
-def rsa_encryption(self_public_key):
+def input_public_key(self_public_key):
     """
-    encrypts a message using RSA with user's chosen keys
-    :param self_public_key: The user's self private key, used optionally for self-encryption
-    :type: int
-    :return: the encrypted message's blocks
-    :rtype: list[int]
+    gets the recipient's public key from the user
+    :param self_public_key: The user's self public key, used optionally for self-encryption
+    :type: tuple[int]
+    :return: the chosen public key (n, e)
+    :rtype: tuple[int]
     """
 
-    msg = input("Please Enter the message to encrypt: ")
+    # the last generated key is offered only in-case self-keys found
+    options = ['1', '2', '3'] if self_public_key is not None else ['1', '3']
+    print("Choose one of the following options:\n"
+          "\t(1). Provide recipient's public key.\n" +
+          ("\t(2). Use the last generated public key (self-encrypt).\n" if self_public_key is not None else "") +
+          "\t(3). Load recipient's public key from a key file.")
+    choice_key = input(f"{'/'.join(options)}: ")
+    while choice_key not in options:
+        print('Invalid option!')
+        choice_key = input(f"{'/'.join(options)}: ")
 
-    # assuming not self-encrypting
-    choice_key = '1'
-    # checking if self-encrypting, in-case self-keys found
-    if self_public_key is not None:
-        print("Choose one of the following options:\n"
-              "\t(1). Provide recipient's public key.\n"
-              "\t(2). Use the last generated public key (self-encrypt).")
-        choice_key = input("1/2: ")
-        while choice_key not in ['1', '2']:
-            print('Invalid option!')
-            choice_key = input("1/2: ")
+    # loading recipient's public key
+    if choice_key == '3':
+        return input_key_file(0)
 
     # getting recipient's public key
     if choice_key == '1':
@@ -81,31 +110,133 @@ def rsa_encryption(self_public_key):
 
         # getting modulus 'n'
         n_str = input('\t(1). Enter recipient\'s modulus (n): ')
-        while n_str.isnumeric() is False or int(n_str).bit_length() < 1024:
-            if n_str.isnumeric() is False:
+        while n_str.isdecimal() is False or my_utilities.int_from_decimal(n_str).bit_length() < 1024:
+            if n_str.isdecimal() is False:
                 print("\t\tPlease enter an int!")
             else:
                 print("Modules is too small. For better security, pick around a 2048-bit sized modulus or bigger.")
 
             n_str = input("\t(1). Enter recipient\'s modulus (n): ")
-        n = int(n_str)
+        n = my_utilities.int_from_decimal(n_str)
 
         # getting public exponent 'e'
         e_str = input('\t(2). Enter recipient\'s public exponent (e): ')
-        while e_str.isnumeric() is False:
+        while e_str.isdecimal() is False:
             print("\t\tPlease enter an int!")
             e_str = input("'\t(2). Enter recipient\'s public exponent (e): ")
-        e = int(e_str)
+        e = my_utilities.int_from_decimal(e_str)
 
     # using self-key
     else:
         n, e = self_public_key[0], self_public_key[1]
 
+    return n, e
+
+
+def input_private_key(self_private_key):
+    """
+    gets the recipient's private key from the user
+    :param self_private_key: The user's self private key, used optionally for self-decryption
+    :type: tuple[int]
+    :return: the chosen private key
+    :rtype: tuple[int]
+    """
+
+    # the last generated key is offered only in-case self-keys found
+    options = ['1', '2', '3'] if self_private_key is not None else ['1', '3']
+    print("Choose one of the following options:\n"
+          "\t(1). Provide recipient's private key.\n" +
+          ("\t(2). Use the last generated private key (self-decrypt).\n" if self_private_key is not None else "") +
+          "\t(3). Load recipient's private key from a key file.")
+    choice_key = input(f"{'/'.join(options)}: ")
+    while choice_key not in options:
+        print('Invalid option!')
+        choice_key = input(f"{'/'.join(options)}: ")
+
+    # loading recipient's private key
+    if choice_key == '3':
+        return input_key_file(1)
+
+    if choice_key == '1':
+        # getting recipient's private key
+        print("Enter recipient's public key (n e): ")
+
+        n_str = input('\t(1). Enter recipient\'s modulus (n): ')
+        while n_str.isdecimal() is False:
+            print("\t\tPlease enter an int!")
+            n_str = input("'\t(1). Enter recipient\'s modulus (n): ")
+        n = my_utilities.int_from_decimal(n_str)
+
+        d_str = input('\t(2). Enter recipient\'s private exponent (d): ')
+        while d_str.isdecimal() is False:
+            print("\t\tPlease enter an int!")
+            d_str = input("'\t(2). Enter recipient\'s public exponent (d): ")
+        d = my_utilities.int_from_decimal(d_str)
+        private_key = (n, d)  # no CRT parameters were given, legacy key
+
+    else:
+        # using self-keys, including the CRT parameters
+        private_key = self_private_key
+
+    return private_key
+
+
+def input_key_file(index):
+    """
+    loads a key from a key file (binary or text) chosen by the user
+    :param index: 0 for the public key, 1 for the private key
+    :type: int
+    :return: the loaded key
+    :rtype: tuple[int]
+    """
+
+    while True:
+        path = input('Please specify the key file path: ')
+        try:
+            key = keyfile.load_keys(path)[index]
+        except (OSError, ValueError):
+            print("Invalid key file!")
+            continue
+        if key is None:
+            print(f"The key file has no {['public', 'private'][index]} key!")
+            continue
+        return key
+
+
+def input_path(prompt):
+    """
+    gets a file path, within an existing directory, from the user
+    :param prompt: the prompt shown to the user
+    :type: str
+    :return: the chosen path
+    :rtype: str
+    """
+
+    path = input(prompt)
+    while os.path.isdir(os.path.dirname(path)) is False:
+        print("Invalid path!")
+        path = input(prompt)
+    return path
+
+
+def rsa_encryption(self_public_key):
+    """
+    encrypts a message using RSA with user's chosen keys
+    :param self_public_key: The user's self private key, used optionally for self-encryption
+    :type: int
+    :return: the encrypted message's blocks
+    :rtype: list[int]
+    """
+
+    msg = input("Please Enter the message to encrypt: ")
+
+    n, e = input_public_key(self_public_key)
+
     # encrypting message
     enc_blocks = rsa.encrypt(msg, (n, e))
     print(f'\nThe encrypted message blocks are:')
     for i in enc_blocks:
-        print(f'\t- {i}')
+        print(f'\t- {my_utilities.int_to_decimal(i)}')
 
     print("\nWould you like to save the encrypted message in a file?")
     choice_save = input("Y/N: ")
@@ -120,12 +251,20 @@ def rsa_encryption(self_public_key):
             print("Invalid path!")
             path = input('Please Specify a file path to save the encrypted message:')
 
-        with open(path, 'w') as f:
-            now = datetime.now()
-            f.write(f'RSA encrypted message blocks: {now.strftime("%d/%m/%Y %H:%M:%S")}\n')
-            for i in enc_blocks:
-                f.write(f'\t- {i}\n')
-            print("\nEncrypted message has been saved successfully!")
+        print("Choose one of the following file formats:\n"
+              "\t(1). Binary (fixed-width blocks, fastest to load).\n"
+              "\t(2). Text (decimal blocks, one per line).")
+        choice_format = input("1/2: ")
+        while choice_format not in ['1', '2']:
+            print('Invalid option!')
+            choice_format = input("1/2: ")
+
+        if choice_format == '1':
+            # binary container, fixed-width blocks instead of decimal text
+            ciphertext_file.save_blocks(path, enc_blocks, n)
+        else:
+            ciphertext_file.save_text_blocks(path, enc_blocks)
+        print("\nEncrypted message has been saved successfully!")
 
 
 def rsa_decryption(self_private_key):
@@ -151,20 +290,21 @@ def rsa_decryption(self_private_key):
     print()
 
     dec_blocks = []
+    fingerprint = None  # known only for container files
 
     # getting blocks one by one
     if choice_dec == '1':
         print("Enter the decrypted blocks, seperated by 'Enter' one by one. Enter '.' to stop:")
         cur_block = input('- ')
-        while cur_block.isnumeric() is False and cur_block != '.':
+        while cur_block.isdecimal() is False and cur_block != '.':
             print("\t\tPlease enter an int!")
             cur_block = input('- ')
 
         while cur_block != '.':
-            dec_blocks.append(int(cur_block))
+            dec_blocks.append(my_utilities.int_from_decimal(cur_block))
 
             cur_block = input('- ')
-            while cur_block.isnumeric() is False and cur_block != '.':
+            while cur_block.isdecimal() is False and cur_block != '.':
                 print("\t\tPlease enter an int!")
                 cur_block = input('- ')
 
@@ -178,53 +318,28 @@ def rsa_decryption(self_private_key):
                 print("Invalid path!")
                 path = input('Please specify the encrypted message\'s file path: ')
 
-            with open(path, 'r') as f:
-                # getting blocks
-                lines = f.readlines()
-                for line in lines[1:]:
-                    try:
-                        cur_block = int(line[3:-1])  # skipping the '\t- ' at the beginning, and the '\n' at the end.
-                        dec_blocks.append(cur_block)
-                    # invalid format
-                    except ValueError:
-                        print('File\'s format isn\'t correct. Please specify an other file.')
-                        continue
-            break
-
-    # assuming not self-encrypting
-    choice_key = '1'
-    # checking if self-encrypting, in-case self-keys found
-    if self_private_key is not None:
-        print("Choose one of the following options:\n"
-              "\t(1). Provide recipient's private key.\n"
-              "\t(2). Use the last generated private key (self-decrypt).")
-        choice_key = input("1/2: ")
-        while choice_key not in ['1', '2']:
-            print('Invalid option!')
-            choice_key = input("1/2: ")
-
-    if choice_key == '1':
-        # getting recipient's private key
-        print("Enter recipient's public key (n e): ")
+            # binary container, written by this program's encryption process
+            if ciphertext_file.is_container(path):
+                with ciphertext_file.CiphertextFile(path) as f:
+                    dec_blocks = list(f)
+                    fingerprint = f.fingerprint
+                break
 
-        n_str = input('\t(1). Enter recipient\'s modulus (n): ')
-        while n_str.isnumeric() is False:
-            print("\t\tPlease enter an int!")
-            n_str = input("'\t(1). Enter recipient\'s modulus (n): ")
-        n = int(n_str)
-
-        d_str = input('\t(2). Enter recipient\'s private exponent (d): ')
-        while d_str.isnumeric() is False:
-            print("\t\tPlease enter an int!")
-            d_str = input("'\t(2). Enter recipient\'s public exponent (d): ")
-        d = int(d_str)
+            # legacy decimal text format, streamed a line at a time
+            try:
+                dec_blocks = ciphertext_file.load_text_blocks(path)
+            # invalid format
+            except ValueError:
+                print('File\'s format isn\'t correct. Please specify an other file.')
+                continue
+            break
 
-    else:
-        # using self-keys
-        n, d = self_private_key[0], self_private_key[1]
+    private_key = input_private_key(self_private_key)
+    if fingerprint is not None:
+        ciphertext_file.check_key(fingerprint, private_key[0])
 
     # decrypting  message
-    dec_msg = rsa.decrypt(dec_blocks, (n, d))
+    dec_msg = rsa.decrypt(dec_blocks, private_key)
     print(f'\nThe decrypted message is:\n\t{dec_msg}')
 
     # saving to file
@@ -247,7 +362,66 @@ def rsa_decryption(self_private_key):
             print("\nDecrypted message has been saved successfully!")
 
 
-def main():
+def rsa_file_encryption(self_public_key):
+    """
+    encrypts a file using RSA with user's chosen keys, streaming it block by block into an output file
+    :param self_public_key: The user's self public key, used optionally for self-encryption
+    :type: tuple[int]
+    """
+
+    in_path = input_path('Please specify the file path to encrypt: ')
+    while os.path.isfile(in_path) is False:
+        print("File not found!")
+        in_path = input_path('Please specify the file path to encrypt: ')
+    out_path = input_path('Please specify a file path to save the encrypted file: ')
+
+    print("Choose one of the following encryption modes:\n"
+          "\t(1). RSA blocks.\n"
+          "\t(2). Hybrid: RSA wraps a session key, a stream cipher encrypts the file (much faster for big files).")
+    choice_mode = input("1/2: ")
+    while choice_mode not in ['1', '2']:
+        print('Invalid option!')
+        choice_mode = input("1/2: ")
+
+    pub_key = input_public_key(self_public_key)
+
+    with open(in_path, 'rb') as in_file, open(out_path, 'wb') as out_file:
+        if choice_mode == '1':
+            count = rsa.encrypt_stream(in_file, out_file, pub_key)
+            print(f"\nFile has been encrypted successfully into {count} blocks!")
+        else:
+            count = hybrid.encrypt_stream(in_file, out_file, pub_key)
+            print(f"\nFile has been encrypted successfully ({count} bytes)!")
+
+
+def rsa_file_decryption(self_private_key):
+    """
+    decrypts a file encrypted by rsa_file_encryption, streaming it block by block into an output file
+    :param self_private_key: The user's self private key, used optionally for self-decryption
+    :type: tuple[int]
+    """
+
+    in_path = input_path('Please specify the encrypted file path: ')
+    while os.path.isfile(in_path) is False:
+        print("File not found!")
+        in_path = input_path('Please specify the encrypted file path: ')
+    out_path = input_path('Please specify a file path to save the decrypted file: ')
+
+    private_key = input_private_key(self_private_key)
+
+    with open(in_path, 'rb') as in_file, open(out_path, 'wb') as out_file:
+        # the encryption mode is told by the file's magic
+        is_hybrid = in_file.read(len(hybrid.MAGIC)) == hybrid.MAGIC
+        in_file.seek(0)
+        if is_hybrid:
+            count = hybrid.decrypt_stream(in_file, out_file, private_key)
+            print(f"\nFile has been decrypted successfully ({count} bytes)!")
+        else:
+            count = rsa.decrypt_stream(in_file, out_file, private_key)
+            print(f"\nFile has been decrypted successfully from {count} blocks!")
+
+
+def interactive(pool=None):
     print('================================================================\n'
           '\t\tRSA Implementation By Yahav Bragin\n'
           '================================================================')
@@ -259,22 +433,26 @@ def main():
               "\t(0) End.\n"
               "\t(1) RSA Keys Generation.\n"
               "\t(2) RSA Encryption.\n"
-              "\t(3) RSA Decryption.")
+              "\t(3) RSA Decryption.\n"
+              "\t(4) RSA File Encryption.\n"
+              "\t(5) RSA File Decryption.")
 
-        choice = input('0/1/2/3: ')
-        while choice not in ['0', '1', '2', '3']:
+        choice = input('0/1/2/3/4/5: ')
+        while choice not in ['0', '1', '2', '3', '4', '5']:
             print('Invalid option!')
             print("Choose one of the next options:\n"
                   "\t(0) End.\n"
                   "\t(1) RSA Keys Generation.\n"
                   "\t(2) RSA Encryption.\n"
-                  "\t(3) RSA Decryption.")
+                  "\t(3) RSA Decryption.\n"
+                  "\t(4) RSA File Encryption.\n"
+                  "\t(5) RSA File Decryption.")
 
-            choice = input('0/1/2/3: ')
+            choice = input('0/1/2/3/4/5: ')
 
         print('\n')
         if choice == '1':
-            public, private = rsa_key_gen()
+            public, private = rsa_key_gen(pool)
         elif choice == '2':
             rsa_encryption(public)
         elif choice == '3':
@@ -282,7 +460,228 @@ def main():
                 rsa_decryption(private)
             except Exception:
                 print("Invalid\Incorrect private exponent for the given modulus")
+        elif choice == '4':
+            rsa_file_encryption(public)
+        elif choice == '5':
+            try:
+                rsa_file_decryption(private)
+            except Exception as e:
+                # a missing file, a truncated container, a failed authentication or a mismatched key
+                print(f"Decryption failed: {e}")
+
+
+def open_input(path):
+    """
+    opens a binary input for the command line interface
+    :param path: the file's path, or '-' for stdin
+    :type: str
+    :return: the binary file object
+    :rtype: typing.BinaryIO
+    """
+
+    return sys.stdin.buffer if path == '-' else open(path, 'rb')
+
+
+@contextmanager
+def output_file(path):
+    """
+    opens a binary output for the command line interface
+    a file is written to a temporary path, and replaces the output only once the command succeeds,
+    so a failed command never leaves an empty or partial output behind
+    :param path: the file's path, or '-' for stdout
+    :type: str
+    :return: the binary file object
+    :rtype: typing.BinaryIO
+    """
+
+    if path == '-':
+        yield sys.stdout.buffer
+        return
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            if os.path.exists(path):
+                os.chmod(temp_path, os.stat(path).st_mode)  # an existing output keeps its permissions
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def cmd_keygen(args):
+    """
+    generates keys and saves them, without prompting
+    :param args: the parsed arguments
+    :type: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+
+    if args.primes > rsa.max_primes(args.bits):
+        print(f"error: a {args.bits} bits key can have {rsa.max_primes(args.bits)} primes at most", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.profile:
+        with generate_prime.collect_stats() as stats:
+            public, private = rsa.generate_keys(args.bits, args.jobs, args.primes)
+        print(stats.report(), file=sys.stderr)
+    else:
+        public, private = rsa.generate_keys(args.bits, args.jobs, args.primes)
+
+    save = keyfile.save_binary_keys if args.format == 'binary' else keyfile.save_keys
+    save(args.out, public, private)
+    if args.public_out is not None:
+        save(args.public_out, public)
+    return EXIT_OK
+
+
+def cmd_encrypt(args):
+    """
+    encrypts a file or stdin with the public key of a key file, without prompting
+    :param args: the parsed arguments
+    :type: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+
+    public, _ = keyfile.load_keys(args.key)
+    if public is None:
+        print("error: key file has no public key", file=sys.stderr)
+        return EXIT_FAILURE
+
+    in_file = open_input(args.input)
+    try:
+        with output_file(args.output) as out_file:
+            if args.hybrid:
+                hybrid.encrypt_stream(in_file, out_file, public)
+            else:
+                rsa.encrypt_stream(in_file, out_file, public)
+    finally:
+        if in_file is not sys.stdin.buffer:
+            in_file.close()
+    return EXIT_OK
+
+
+def cmd_decrypt(args):
+    """
+    decrypts a file or stdin with the private key of a key file, without prompting
+    the encryption mode is told by the input's magic
+    :param args: the parsed arguments
+    :type: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+
+    _, private = keyfile.load_keys(args.key)
+    if private is None:
+        print("error: key file has no private key", file=sys.stderr)
+        return EXIT_FAILURE
+
+    in_file = open_input(args.input)
+    try:
+        with output_file(args.output) as out_file:
+            if in_file.peek(len(hybrid.MAGIC))[:len(hybrid.MAGIC)] == hybrid.MAGIC:
+                hybrid.decrypt_stream(in_file, out_file, private)
+            else:
+                rsa.decrypt_stream(in_file, out_file, private)
+    finally:
+        if in_file is not sys.stdin.buffer:
+            in_file.close()
+    return EXIT_OK
+
+
+def cmd_interactive(args):
+    """
+    runs the interactive menu
+    :param args: the parsed arguments
+    :type: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+
+    if args.pool_capacity == 0:
+        interactive()
+        return EXIT_OK
+
+    with key_pool.KeyPool([2048, 3072, 4096], args.pool_capacity, min(args.pool_low_water, args.pool_capacity),
+                          path=args.pool_dir) as pool:
+        interactive(pool)
+    return EXIT_OK
+
+
+def build_parser():
+    """
+    builds the command line interface's parser
+    :return: the parser
+    :rtype: argparse.ArgumentParser
+    """
+
+    parser = argparse.ArgumentParser(prog='main.py', description='RSA key generation, encryption and decryption.')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    keygen = subparsers.add_parser('keygen', help='generate a key pair into a key file')
+    keygen.add_argument('--bits', type=int, choices=[2048, 3072, 4096], default=2048, help='key size (default: 2048)')
+    keygen.add_argument('--out', required=True, help='key file path, holding both keys')
+    keygen.add_argument('--public-out', help='optional key file path, holding only the public key')
+    keygen.add_argument('--primes', type=int, choices=[2, 3, 4], default=2,
+                        help='amount of primes, 3 for 3072 bits keys and up, 4 for 4096 bits keys (default: 2)')
+    keygen.add_argument('--jobs', type=int, default=None, help='worker processes (default: all the cores)')
+    keygen.add_argument('--format', choices=['binary', 'text'], default='binary',
+                        help='key file format (default: binary, fastest to load)')
+    keygen.add_argument('--profile', action='store_true', help='print a prime generation profile to stderr')
+    keygen.set_defaults(func=cmd_keygen)
+
+    encrypt = subparsers.add_parser('encrypt', help='encrypt a file or stdin')
+    encrypt.add_argument('--key', required=True, help='key file holding the recipient\'s public key')
+    encrypt.add_argument('--in', dest='input', default='-', help='input path (default: stdin)')
+    encrypt.add_argument('--out', dest='output', default='-', help='output path (default: stdout)')
+    encrypt.add_argument('--hybrid', action='store_true',
+                         help='wrap a session key with RSA and encrypt with a stream cipher (faster for big inputs)')
+    encrypt.set_defaults(func=cmd_encrypt)
+
+    decrypt = subparsers.add_parser('decrypt', help='decrypt a file or stdin')
+    decrypt.add_argument('--key', required=True, help='key file holding the private key')
+    decrypt.add_argument('--in', dest='input', default='-', help='input path (default: stdin)')
+    decrypt.add_argument('--out', dest='output', default='-', help='output path (default: stdout)')
+    decrypt.set_defaults(func=cmd_decrypt)
+
+    menu = subparsers.add_parser('interactive', help='run the interactive menu (default)')
+    menu.add_argument('--pool-capacity', type=int, default=0,
+                      help='key pairs pre-generated per key size in the background (default: 0, disabled)')
+    menu.add_argument('--pool-low-water', type=int, default=1,
+                      help='key pairs per key size below which the pool is refilled (default: 1)')
+    menu.add_argument('--pool-dir', help='directory to keep the pre-generated key pairs in across runs')
+    menu.set_defaults(func=cmd_interactive)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    runs the command line interface. with no command, the interactive menu is run
+    :param argv: the arguments, None for sys.argv
+    :type: list[str] | None
+    :return: the exit code
+    :rtype: int
+    """
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(['interactive'])
+
+    try:
+        return args.func(args)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_IO
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_FAILURE
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -1,3 +1,14 @@
+import hashlib
+import importlib.util
+import math
+import sys
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
 def montgomery_ladder(x, k, N):
     """
     performs modular exponentiation x^k (mod N) securely and efficiently using the montgomery-ladder method
@@ -12,23 +23,224 @@ def montgomery_ladder(x, k, N):
     :rtype: int
     """
 
-    x %= N
+    return ModContext(N).ladder(x, k)
+
+
+def window_pow(x, k, N):
+    """
+    performs modular exponentiation x^k (mod N) with the built-in pow, which uses window exponentiation in C.
+    it is many times faster than the montgomery-ladder, but isn't constant-time: use it for public exponents only.
+
+    :param x: the base
+    :type x: int
+    :param k: the exponent
+    :type k: int
+    :param N: the modulus
+    :type N: int
+    :return: the result: x^k (mod N)
+    :rtype: int
+    """
+
+    return pow(x, k, N)
+
+
+def gmpy2_pow(x, k, N):
+    """
+    performs modular exponentiation x^k (mod N) with GMP, available only when gmpy2 is installed.
+
+    :param x: the base
+    :type x: int
+    :param k: the exponent
+    :type k: int
+    :param N: the modulus
+    :type N: int
+    :return: the result: x^k (mod N)
+    :rtype: int
+    """
+
+    return int(gmpy2.powmod(x, k, N))
+
+
+# registered modular exponentiation backends, by name
+MOD_EXP_BACKENDS = {'ladder': montgomery_ladder, 'window': window_pow}
+if gmpy2 is not None:
+    MOD_EXP_BACKENDS['gmpy2'] = gmpy2_pow
+
+# backend for secret exponents (private keys), constant-time
+PRIVATE_BACKEND = 'ladder'
+# backend for public exponents and primality tests, the fastest one available
+PUBLIC_BACKEND = 'gmpy2' if gmpy2 is not None else 'window'
+
+
+# smallest modulus, in bits, for which Barrett reduction beats the built-in '%' (measured with CPython's int)
+BARRETT_MIN_BITS = 4096
+
+
+class ModContext:
+    """
+    arithmetic modulo a fixed N, with the per-modulus setup done once and reused by every operation under N.
+    big moduli are reduced with Barrett reduction, two multiplications and shifts instead of a long division,
+    smaller ones with the built-in '%', which is faster there. with gmpy2 installed, N is also kept as an mpz.
+    """
+
+    __slots__ = ('N', 'shift', 'mu', 'mpz')
+
+    def __init__(self, N):
+        """
+        :param N: the modulus
+        :type N: int
+        """
+
+        self.N = N
+        self.shift = N.bit_length()
+        # Barrett factor floor(4^shift / N), None when the built-in '%' is used
+        self.mu = (1 << (2 * self.shift)) // N if self.shift >= BARRETT_MIN_BITS else None
+        self.mpz = gmpy2.mpz(N) if gmpy2 is not None else None
+
+    def reduce(self, t):
+        """
+        :param t: the number to reduce, 0 <= t < N^2
+        :type t: int
+        :return: t (mod N)
+        :rtype: int
+        """
+
+        if self.mu is None:
+            return t % self.N
+
+        # the estimated quotient is short of the real one by 2 at most
+        r = t - (((t >> (self.shift - 1)) * self.mu) >> (self.shift + 1)) * self.N
+        while r >= self.N:
+            r -= self.N
+        return r
+
+    def mul(self, a, b):
+        """
+        :return: a * b (mod N), for a, b reduced modulo N
+        :rtype: int
+        """
+
+        return self.reduce(a * b)
+
+    def sqr(self, a):
+        """
+        :return: a^2 (mod N), for a reduced modulo N
+        :rtype: int
+        """
+
+        return self.reduce(a * a)
+
+    def ladder(self, x, k):
+        """
+        performs modular exponentiation x^k (mod N) securely using the montgomery-ladder method:
+        every bit of the exponent costs the same multiplication and squaring.
+
+        :param x: the base
+        :type x: int
+        :param k: the exponent
+        :type k: int
+        :return: the result: x^k (mod N)
+        :rtype: int
+        """
+
+        # Initialize two variables to hold the intermediate results
+        r0 = 1 % self.N
+        r1 = x % self.N
+
+        # Loop through each bit of the binary exponent from most significant to the least significant
+        for bit in bin(k)[2:]:
+            if bit == '0':
+                r1 = self.mul(r1, r0)
+                r0 = self.sqr(r0)
+            else:
+                r0 = self.mul(r0, r1)
+                r1 = self.sqr(r1)
+
+        # The final result is in r0
+        return r0
+
+    def pow(self, x, k, backend=None):
+        """
+        performs modular exponentiation x^k (mod N) with a registered backend, reusing the context's setup.
+
+        :param x: the base
+        :type x: int
+        :param k: the exponent
+        :type k: int
+        :param backend: the backend's name. None uses PUBLIC_BACKEND, so secret exponents must pass PRIVATE_BACKEND
+        :type backend: str | None
+        :return: the result: x^k (mod N)
+        :rtype: int
+        """
+
+        func = MOD_EXP_BACKENDS.get(PUBLIC_BACKEND if backend is None else backend)
+        if func is montgomery_ladder:
+            return self.ladder(x, k)
+        if func is gmpy2_pow:
+            return int(gmpy2.powmod(x, k, self.mpz))
+        return mod_exp(x, k, self.N, backend)
+
+
+def register_backend(name, func):
+    """
+    registers a modular exponentiation backend, so it can be picked by name.
+
+    :param name: the backend's name
+    :type name: str
+    :param func: the backend, called as func(x, k, N) and returning x^k (mod N)
+    :type func: function
+    """
+
+    MOD_EXP_BACKENDS[name] = func
+
+
+def mod_exp(x, k, N, backend=None):
+    """
+    performs modular exponentiation x^k (mod N) with a registered backend.
+
+    :param x: the base
+    :type x: int
+    :param k: the exponent
+    :type k: int
+    :param N: the modulus
+    :type N: int
+    :param backend: the backend's name. None uses PUBLIC_BACKEND, so secret exponents must pass PRIVATE_BACKEND
+    :type backend: str | None
+    :return: the result: x^k (mod N)
+    :rtype: int
+    """
+
+    if backend is None:
+        backend = PUBLIC_BACKEND
+    if backend not in MOD_EXP_BACKENDS:
+        raise ValueError(f"Unknown modular exponentiation backend: {backend}")
+
+    return MOD_EXP_BACKENDS[backend](x, k, N)
+
+
+def lazy_import(name):
+    """
+    imports a module lazily: it is executed on the first access to one of its attributes, instead of here.
+    short-lived command line runs then pay only for the modules they actually use.
+
+    :param name: the module's name
+    :type name: str
+    :return: the module, or None if it isn't installed
+    :rtype: types.ModuleType | None
+    """
 
-    # Initialize two variables to hold the intermediate results
-    r0 = 1
-    r1 = x
+    if name in sys.modules:
+        return sys.modules[name]
 
-    # Loop through each bit of the binary exponent from most significant to the least significant
-    for bit in bin(k)[2:]:
-        if bit == '0':
-            r1 = (r1 * r0) % N
-            r0 = (r0 ** 2) % N
-        else:
-            r0 = (r0 * r1) % N
-            r1 = (r1 ** 2) % N
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
 
-    # The final result is in r0
-    return r0
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
 
 
 def mod_inverse(a, m):
@@ -54,3 +266,110 @@ def mod_inverse(a, m):
 
     # Ensure x is positive
     return x + m0 if x < 0 else x
+
+
+# decimal strings up to this length are converted directly, below CPython's int/str conversion limit (4300 digits)
+DECIMAL_LEAF_DIGITS = 1024
+
+# powers of 10 used to split decimal conversions, by exponent
+decimal_powers = {}
+
+
+def get_decimal_split(digits):
+    """
+    picks where to split a decimal conversion of a given length: DECIMAL_LEAF_DIGITS times a power of two,
+    so that the powers of 10 are shared by all the conversions.
+
+    :param digits: the amount of decimal digits
+    :type digits: int
+    :return: the amount of low digits, and 10 to its power
+    :rtype: tuple[int, int]
+    """
+
+    split = DECIMAL_LEAF_DIGITS
+    while 2 * split < digits:
+        split *= 2
+    if split not in decimal_powers:
+        decimal_powers[split] = 10 ** split
+    return split, decimal_powers[split]
+
+
+def int_from_decimal(digits):
+    """
+    converts a decimal string to an int, splitting it in halves recursively (divide and conquer).
+    the built-in int() is quadratic in the amount of digits and refuses more than 4300 of them,
+    while the halves are joined with a single multiplication each, which is subquadratic (Karatsuba).
+
+    :param digits: the decimal digits, without a sign
+    :type digits: str
+    :return: the number
+    :rtype: int
+    """
+
+    if not digits.isdecimal():
+        raise ValueError(f"Invalid decimal number: {digits[:20]!r}")
+
+    if len(digits) <= DECIMAL_LEAF_DIGITS:
+        return int(digits)
+
+    split, power = get_decimal_split(len(digits))
+    return int_from_decimal(digits[:-split]) * power + int_from_decimal(digits[-split:])
+
+
+def int_to_decimal(num):
+    """
+    converts a non-negative int to a decimal string, splitting it in halves recursively (divide and conquer).
+    unlike the built-in str(), it isn't limited to 4300 digits.
+
+    :param num: the number
+    :type num: int
+    :return: the decimal digits
+    :rtype: str
+    """
+
+    digits = int(num.bit_length() * 0.30103) + 1  # log10(2) digits per bit, one digit too many at most
+    if digits <= DECIMAL_LEAF_DIGITS:
+        return str(num)
+
+    split, power = get_decimal_split(digits)
+    # the estimate may be a digit too many: a number below the split point is split at the next lower one
+    while num < power and split > DECIMAL_LEAF_DIGITS:
+        split, power = get_decimal_split(split)
+    if num < power:
+        return str(num)  # less than DECIMAL_LEAF_DIGITS digits
+
+    high, low = divmod(num, power)
+    return int_to_decimal(high) + int_to_decimal(low).zfill(split)
+
+
+def is_square(n):
+    """
+    checks if a given number is a perfect square.
+
+    :param n: the given non-negative number
+    :type n: int
+    :return: True if n is a perfect square, False otherwise
+    :rtype: bool
+    """
+
+    root = math.isqrt(n)
+    return root * root == n
+
+
+def fingerprint(n, secret=None):
+    """
+    computes a fingerprint of a modulus, used to tell apart data bound to different keys.
+
+    :param n: the modulus
+    :type n: int
+    :param secret: optional secret value less than n, such as the private exponent, bound into the fingerprint
+    :type secret: int | None
+    :return: the SHA-256 digest of the modulus' big-endian bytes, followed by the secret's bytes of the same width
+    :rtype: bytes
+    """
+
+    width = (n.bit_length() + 7) // 8
+    data = n.to_bytes(width, byteorder='big')
+    if secret is not None:
+        data += secret.to_bytes(width, byteorder='big')
+    return hashlib.sha256(data).digest()
@@ -1,28 +1,198 @@
 import my_utilities
+import generate_prime
+import ciphertext_file
+import functools
+import keys
 import os
 
+# amount of blocks read at a time by iter_encrypt
+STREAM_BLOCKS = 64
 
-def get_keys(p, q):
+# public exponent of the generated keys
+PUBLIC_EXPONENT = 65537
+
+
+def get_keys(p, q, *others):
     """
     Generates RSA private and public keys using given numbers assumed to be primes
     :param p: first prim
     :type p: int
     :param q: second prime
     :type q: int
-    :return: the private and public keys in a tuple ((n, e), (n, d))
+    :param others: additional primes, for a multi-prime key (RFC 8017)
+    :type others: int
+    :return: the private and public keys in a tuple ((n, e), (n, d, p, q, dP, dQ, qInv)),
+             the private key followed by (r, d, t) of every additional prime
     :rtype: tuple[tuple[int]]
     """
 
-    n = p * q  # calculating modulus
+    primes = (p, q) + others
 
-    phi_n = (p - 1) * (q - 1)  # calculating phi_n, almost impossible for one who only knows n, and not p, q
+    n = 1
+    phi_n = 1
+    for prime in primes:
+        n *= prime  # calculating modulus
+        phi_n *= prime - 1  # calculating phi_n, almost impossible for one who only knows n, and not the primes
 
-    e = 65537  # public exponent, common in industry
+    e = PUBLIC_EXPONENT  # public exponent, common in industry
 
     # calculating the multiplicative inverse of e: d - the private exponent
     d = my_utilities.mod_inverse(e, phi_n)
 
-    return (n, e), (n, d)
+    # CRT parameters, used to split each private-key operation into half-size (or smaller) exponentiations
+    dp = d % (p - 1)
+    dq = d % (q - 1)
+    q_inv = my_utilities.mod_inverse(q, p)
+    private_key = (n, d, p, q, dp, dq, q_inv)
+
+    # every additional prime r gets its exponent and the inverse t of the product of the primes before it
+    product = p * q
+    for r in others:
+        private_key += (r, d % (r - 1), my_utilities.mod_inverse(product % r, r))
+        product *= r
+
+    return (n, e), private_key
+
+
+def max_primes(key_size):
+    """
+    the most primes a key of a given size may have, so that none of them is small enough to be factored out.
+
+    :param key_size: the size of the modulus in bits
+    :type key_size: int
+    :return: the maximal amount of primes
+    :rtype: int
+    """
+
+    if key_size < 3072:
+        return 2
+    return 3 if key_size < 4096 else 4
+
+
+def get_prime_sizes(key_size, primes=2):
+    """
+    splits a key size between its primes, as evenly as possible.
+
+    :param key_size: the size of the modulus in bits
+    :type key_size: int
+    :param primes: the amount of primes
+    :type primes: int
+    :return: the size of each prime in bits, the biggest first
+    :rtype: list[int]
+    """
+
+    if not 2 <= primes <= max_primes(key_size):
+        raise ValueError(f"A {key_size} bits key can have 2 to {max_primes(key_size)} primes, not {primes}")
+
+    return [key_size // primes + (1 if i < key_size % primes else 0) for i in range(primes)]
+
+
+def get_unfit_prime(primes, key_size):
+    """
+    finds a prime that keeps a set of primes from making a key of a given size: a repeated prime,
+    or one for which the public exponent has no inverse.
+    two primes with their top two bits set always make a modulus of the full size, but more primes may fall
+    a bit short, so the prime with the smallest leading bits is the one to replace then.
+
+    :param primes: the primes
+    :type primes: list[int]
+    :param key_size: the size of the modulus in bits
+    :type key_size: int
+    :return: the index of the prime to replace, None if the primes make a valid key
+    :rtype: int | None
+    """
+
+    for i, prime in enumerate(primes):
+        if prime in primes[:i]:  # the primes of a key are distinct
+            return i
+        if (prime - 1) % PUBLIC_EXPONENT == 0:  # e has no inverse modulo phi_n
+            return i
+
+    n = 1
+    for prime in primes:
+        n *= prime
+    if n.bit_length() != key_size:
+        return min(range(len(primes)), key=lambda i: primes[i] / (1 << primes[i].bit_length()))
+
+    return None
+
+
+def generate_keys(key_size, jobs=None, primes=2):
+    """
+    Generates a new pair of RSA private and public keys of a given size.
+    the primes are searched for in parallel, over a pool of worker processes.
+
+    :param key_size: the size of the modulus in bits
+    :type key_size: int
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 searches in this process
+    :type jobs: int | None
+    :param primes: the amount of primes, more than 2 makes a multi-prime key (see max_primes)
+    :type primes: int
+    :return: the private and public keys in a tuple ((n, e), (n, d, p, q, dP, dQ, qInv)),
+             the private key followed by (r, d, t) of every additional prime
+    :rtype: tuple[tuple[int]]
+    """
+
+    sizes = get_prime_sizes(key_size, primes)
+
+    # primes of the same size are searched for at once
+    found = []
+    for bits in sorted(set(sizes), reverse=True):
+        found += generate_prime.get_primes(bits, sizes.count(bits), jobs)
+
+    i = get_unfit_prime(found, key_size)
+    while i is not None:
+        found[i] = generate_prime.get_prime(sizes[i], jobs)
+        i = get_unfit_prime(found, key_size)
+
+    return get_keys(*found)
+
+
+# masks for the word-parallel padding scan, per padded block length: 0x7f in every byte,
+# 0x80 in bytes 2 to the one before last of the block, where a separator can start
+unpad_masks = {}
+
+
+def get_nonzero_random(length):
+    """
+    generates non-zero random bytes, with a single urandom call in all but rare cases.
+
+    :param length: the amount of bytes
+    :type length: int
+    :return: the random bytes, none of them 0x00
+    :rtype: bytes
+    """
+
+    # about one in 256 bytes is 0x00 and dropped, so a little more than needed is drawn at once
+    random_bytes = os.urandom(length + length // 64 + 16).replace(b'\x00', b'')
+    while len(random_bytes) < length:
+        random_bytes += os.urandom(length - len(random_bytes) + 16).replace(b'\x00', b'')
+    return random_bytes[:length]
+
+
+def pkcs1_v1_5_pad_into(buffer, message_bytes, padding):
+    """
+    writes a PKCS#1 v1.5 padded message into a preallocated buffer, without intermediate copies.
+
+    :param buffer: the buffer, as long as the padded message
+    :type buffer: bytearray
+    :param message_bytes: The message to be padded.
+    :type message_bytes: bytes | memoryview
+    :param padding: non-zero random bytes, exactly as many as the buffer has left for the padding string
+    :type padding: bytes | memoryview
+    """
+
+    padding_length = len(buffer) - len(message_bytes) - 4
+
+    if padding_length < 8:
+        raise ValueError("Message too long for PKCS#1 v1.5 padding")
+
+    # The padding consists of a leading 0x00 byte, a 0x02 byte, the padding string, and an ending 0x00, 0x00 bytes
+    buffer[0] = 0x00
+    buffer[1] = 0x02
+    buffer[2:2 + padding_length] = padding
+    buffer[2 + padding_length] = buffer[3 + padding_length] = 0x00
+    buffer[4 + padding_length:] = message_bytes
 
 
 def pkcs1_v1_5_pad(message_bytes, target_length):
@@ -37,17 +207,49 @@ def pkcs1_v1_5_pad(message_bytes, target_length):
     :rtype: bytes
     """
 
-    # Calculate the required padding length
-    padding_length = target_length - len(message_bytes) - 3
+    buffer = bytearray(target_length + 1)
+    # the padding string is non-zero, so it never contains the 0x00, 0x00 separator
+    pkcs1_v1_5_pad_into(buffer, message_bytes, get_nonzero_random(max(target_length - len(message_bytes) - 3, 0)))
+    return bytes(buffer)
 
-    if padding_length < 8:
-        raise ValueError("Message too long for PKCS#1 v1.5 padding")
 
-    # Generate the padding string (non-zero random bytes)
-    padding = os.urandom(padding_length)
+def pkcs1_v1_5_unpad_int(padded_num, length):
+    """
+    Remove PKCS#1 v1.5 padding from a padded message, given as the integer of its big-endian bytes.
+    the separator is located with whole-block integer operations instead of a byte-by-byte scan,
+    so the time taken doesn't depend on where the separator is, or on whether the padding is valid.
+
+    :param padded_num: The padded message, as an integer.
+    :type padded_num: int
+    :param length: The length of the padded message, in bytes.
+    :type length: int
+    :return: The unpadded message.
+    :rtype: bytes
+    """
 
-    # The padding consists of a leading 0x00 byte, a 0x02 byte, the padding string, and an ending 0x00, 0x00 bytes
-    return b'\x00\x02' + padding + b'\x00\x00' + message_bytes
+    if length < 11:
+        raise ValueError("PKCS#1 v1.5 padding incorrect")
+
+    if length not in unpad_masks:
+        unpad_masks[length] = (int.from_bytes(b'\x7f' * length, byteorder='big'),
+                               int.from_bytes(b'\x80' * (length - 3) + b'\x00', byteorder='big'))
+    low_bits, high_bits = unpad_masks[length]
+
+    # a byte of 'pairs' is zero where a byte of the message and the byte after it are both zero
+    pairs = padded_num | (padded_num << 8)
+    # the high bit of each byte is set where that byte is zero, carries never cross bytes since 0x7f + 0x7f < 0x100
+    zero_pairs = high_bits & ~(((pairs & low_bits) + low_bits) | pairs)
+
+    # the first separator after the 0x00, 0x02 header is the most significant zero pair
+    separator = (zero_pairs.bit_length() - 1) // 8  # the separator's position, counted from the last byte
+    padding_length = length - 3 - separator
+
+    # validity is checked once, after the scan: a 0x00, 0x02 header, a separator, and 8 bytes of padding at least
+    if (padded_num >> (8 * (length - 2))) != 0x02 or zero_pairs == 0 or padding_length < 8:
+        raise ValueError("PKCS#1 v1.5 padding incorrect")
+
+    # Extract the message part after the separator
+    return (padded_num & ((1 << (8 * (separator - 1))) - 1)).to_bytes(separator - 1, byteorder='big')
 
 
 def pkcs1_v1_5_unpad(padded_message_bytes):
@@ -60,19 +262,7 @@ def pkcs1_v1_5_unpad(padded_message_bytes):
     :rtype: bytes
     """
 
-    if len(padded_message_bytes) < 11:
-        raise ValueError("PKCS#1 v1.5 padding incorrect")
-
-    # Locate the first zero byte after the 0x02 byte
-    zero_index = padded_message_bytes.find(b'\x00\x00', 2)
-
-    if zero_index == -1:
-        raise ValueError("PKCS#1 v1.5 padding incorrect")
-
-    # Extract the message part after the zero byte
-    message_bytes = padded_message_bytes[zero_index + 2:]
-
-    return message_bytes
+    return pkcs1_v1_5_unpad_int(int.from_bytes(padded_message_bytes, byteorder='big'), len(padded_message_bytes))
 
 
 def num_encryption(num, pub_key):
@@ -82,16 +272,16 @@ def num_encryption(num, pub_key):
     :param num: the given number to encrypt, assuming is less than n
     :type num: int
     :param pub_key: the recipient's public key (n, e)
-    :type pub_key: tuple[int]
+    :type pub_key: tuple[int] | keys.PublicKey
     :return: the encrypted number
     :rtype: int
     """
 
-    n, e = pub_key
-    if num >= n:
-        raise Exception(f"The given number is too big. It should be less than {n}")
+    key = keys.get_public_key(pub_key)  # the key object keeps the arithmetic context of n between calls
+    if num >= key.n:
+        raise Exception(f"The given number is too big. It should be less than {key.n}")
 
-    return my_utilities.montgomery_ladder(num, e, n)  # num^e (mod n)
+    return key.context.pow(num, key.e, my_utilities.PUBLIC_BACKEND)  # num^e (mod n), public exponent
 
 
 def num_decryption(num, private_key):
@@ -100,18 +290,92 @@ def num_decryption(num, private_key):
 
     :param num: the given number to decrypt, assuming is less than n
     :type num: int
-    :param private_key: the recipient's private key (n, d)
-    :type private_key: tuple[int]
+    :param private_key: the recipient's private key (n, d, p, q, dP, dQ, qInv), followed by (r, d, t) of every
+                        additional prime of a multi-prime key.
+                        legacy keys of the form (n, d) are also accepted, without the CRT speedup.
+    :type private_key: tuple[int] | keys.PrivateKey
     :return: the decrypted number
     :rtype: int
     """
 
-    n, d = private_key
+    key = keys.get_private_key(private_key)  # the key object keeps the arithmetic contexts of its primes
+
+    if num >= key.n:
+        raise Exception(f"The given number is too big. It should be less than {key.n}")
+
+    # legacy key, no CRT parameters
+    if not key.crt:
+        return key.contexts[0].pow(num, key.d, my_utilities.PRIVATE_BACKEND)  # num^d (mod n)
+
+    # Chinese Remainder Theorem: two half-size exponentiations instead of a full-size one
+    p, q, dp, dq, q_inv = key.crt[:5]
+    context_p, context_q = key.contexts[:2]
+    m1 = context_p.pow(num, dp, my_utilities.PRIVATE_BACKEND)  # num^dP (mod p)
+    m2 = context_q.pow(num, dq, my_utilities.PRIVATE_BACKEND)  # num^dQ (mod q)
+    h = (q_inv * (m1 - m2)) % p  # Garner's recombination
+    m = m2 + h * q  # num^d (mod p * q)
+
+    # multi-prime key: every additional prime is recombined into the result the same way (RFC 8017, RSADP)
+    product = p * q
+    for i, context_r in zip(range(5, len(key.crt), 3), key.contexts[2:]):
+        r, dr, t = key.crt[i:i + 3]
+        mr = context_r.pow(num, dr, my_utilities.PRIVATE_BACKEND)  # num^dR (mod r)
+        m += ((mr - m) * t % r) * product
+        product *= r
+
+    return m  # num^d (mod n)
+
+
+def pad_message(msg_bytes, pub_key):
+    """
+    splits a message into blocks, and applies PKCS#1 v1.5 padding to each of them.
+
+    :param msg_bytes: the message to be padded.
+    :type msg_bytes: bytes
+    :param pub_key: the public key (n, e) the blocks will be encrypted with
+    :type pub_key: tuple[int] | keys.PublicKey
+    :return: list of integers representing the padded blocks of the message, each smaller than n.
+    :rtype: list[int]
+    """
+
+    # block size based on the modulus size (in bytes), precomputed by the key object
+    block_size = keys.get_public_key(pub_key).block_size
+    data_size = block_size - 11  # Subtract 11 for padding
+    message = memoryview(msg_bytes)
+
+    # the padding of the whole message is drawn at once: a padded block is block_size + 1 bytes long,
+    # 4 of them are the header and the separator
+    blocks_count = -(-len(message) // data_size)
+    padding = memoryview(get_nonzero_random(blocks_count * (block_size - 3) - len(message)))
+
+    buffer = bytearray(block_size + 1)  # every block is padded into the same buffer
+    padded_blocks = []
+    offset = 0
+    for i in range(0, len(message), data_size):
+        block = message[i:i + data_size]
+        padding_length = block_size - 3 - len(block)
+        pkcs1_v1_5_pad_into(buffer, block, padding[offset:offset + padding_length])
+        offset += padding_length
+        padded_blocks.append(int.from_bytes(buffer, byteorder='big'))  # using big-endian method
+    return padded_blocks
+
+
+def unpad_message(decrypted_blocks, private_key):
+    """
+    removes the PKCS#1 v1.5 padding from decrypted blocks, and reassembles the message.
+
+    :param decrypted_blocks: list of integers representing the decrypted blocks of the message.
+    :type decrypted_blocks: list[int]
+    :param private_key: the private key the blocks were decrypted with
+    :type private_key: tuple[int] | keys.PrivateKey
+    :return: The message.
+    :rtype: bytes
+    """
 
-    if num >= n:
-        raise Exception(f"The given number is too big. It should be less than {n}")
+    byte_length = keys.get_private_key(private_key).byte_length
 
-    return my_utilities.montgomery_ladder(num, d, n)  # num^d (mod n)
+    # Concatenate decrypted blocks to form the original message, unpadding each block straight from its integer
+    return b''.join(pkcs1_v1_5_unpad_int(decrypted_block, byte_length) for decrypted_block in decrypted_blocks)
 
 
 def encrypt(msg, pub_key):
@@ -122,56 +386,290 @@ def encrypt(msg, pub_key):
     :type msg: str
     :param pub_key: recipient's public key (n, e).
                     not that the function won't work well for small n because of the padding.
-    :type pub_key: tuple[int]
+    :type pub_key: tuple[int] | keys.PublicKey
     :return: list of integers representing encrypted blocks of the message.
     :rtype: list[int]
     """
-    # Unpack the recipient's public key
-    n, e = pub_key  # Modulus, Public exponent
 
-    # Convert the message to bytes
-    msg_bytes = msg.encode('utf-8')
+    # Convert the message to padded blocks
+    padded_blocks = pad_message(msg.encode('utf-8'), pub_key)
 
-    # Determine the block size based on the modulus size (in bytes)
-    block_size = (n.bit_length() + 7) // 8 - 1  # round to nearest byte, subtract 1 to ensure block is smaller than n
     # Encrypt each block of the message using RSA num_encryption
-    encrypted_blocks = []
-    for i in range(0, len(msg_bytes), block_size - 11):  # Subtract 11 for padding
-        block = msg_bytes[i:i + block_size - 11]
-        padded_block = pkcs1_v1_5_pad(block, block_size)
-        block_int = int.from_bytes(padded_block, byteorder='big')  # using big-endian method
-        encrypted_block = num_encryption(block_int, pub_key)
-        encrypted_blocks.append(encrypted_block)
-    return encrypted_blocks
+    return [num_encryption(padded_block, pub_key) for padded_block in padded_blocks]
 
 
-def decrypt(encrypted_blocks, private_key):
+def decrypt(encrypted_blocks, private_key, cache=None):
     """
     decrypts a list of encrypted blocks using RSA decryption with PKCS#1 v1.5 padding.
 
     :param encrypted_blocks: list of integers representing encrypted blocks of the message.
     :type encrypted_blocks: list[int]
-    :param private_key: recipient's private key (n, d)
-    :type private_key: tuple[int]
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int] | keys.PrivateKey
+    :param cache: optional cache of decrypted blocks, so that repeated blocks are decrypted once. None disables it
+    :type cache: decryption_cache.DecryptionCache | None
     :return: The decrypted message.
     :rtype: str
     """
 
-    # Unpack the recipient's private key
-    n, d = private_key  # Modulus, Private exponent
-
     # Decrypt each block and reassemble the original message
-    decrypted_blocks = []
-    for encrypted_block in encrypted_blocks:
-        decrypted_block = num_decryption(encrypted_block, private_key)
-        # Convert the decrypted block back to bytes
-        padded_block = decrypted_block.to_bytes((n.bit_length() + 7) // 8, byteorder='big')
-        message_block = pkcs1_v1_5_unpad(padded_block)
-        decrypted_blocks.append(message_block)
+    if cache is None:
+        decrypted_blocks = [num_decryption(encrypted_block, private_key) for encrypted_block in encrypted_blocks]
+    else:
+        decrypted_blocks = num_decryption_batch(encrypted_blocks, private_key, 1, cache=cache)
+    return unpad_message(decrypted_blocks, private_key).decode('utf-8')
+
+
+# the key of the current batch, shipped once to each worker process by the pool's initializer
+worker_key = None
+
+
+def init_worker(key):
+    """
+    stores the batch's key in a worker process, so tasks carry only their blocks.
+
+    :param key: the public or private key of the batch
+    :type key: tuple[int]
+    """
+
+    global worker_key
+    worker_key = key
+
+
+def apply_worker(func, num):
+    """
+    encrypts or decrypts a single number in a worker process, with the key stored by init_worker.
+
+    :param func: num_encryption or num_decryption
+    :type func: function
+    :param num: the number
+    :type num: int
+    :return: the result
+    :rtype: int
+    """
+
+    return func(num, worker_key)
+
+
+def map_blocks(func, blocks, key, jobs=None, chunksize=None):
+    """
+    applies num_encryption or num_decryption to a list of blocks over a process pool, keeping the blocks' order.
+    in this process, the key is passed to every call: the worker_key global is set only in worker processes,
+    so concurrent batches in threads never see each other's keys.
+
+    :param func: num_encryption or num_decryption
+    :type func: function
+    :param blocks: the blocks
+    :type blocks: list[int]
+    :param key: the key of the batch, shipped once to each worker process
+    :type key: tuple[int]
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of blocks dispatched to a worker at once. None splits the blocks evenly
+    :type chunksize: int | None
+    :return: the results, in the blocks' order
+    :rtype: list[int]
+    """
+
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if workers == 1 or len(blocks) <= 1:
+        return [func(block, key) for block in blocks]
 
-    # Concatenate decrypted blocks to form the original message
-    original_message_bytes = b''.join(decrypted_blocks)
-    original_message = original_message_bytes.decode('utf-8')
+    from concurrent.futures import ProcessPoolExecutor  # only needed with worker processes
 
-    return original_message
+    if chunksize is None:
+        chunksize = max(1, len(blocks) // (4 * workers))  # a few chunks per worker, to balance the load
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(key,)) as executor:
+        return list(executor.map(functools.partial(apply_worker, func), blocks, chunksize=chunksize))
+
+
+def num_encryption_batch(nums, pub_key, jobs=None, chunksize=None):
+    """
+    encrypts a list of numbers with the same public key, in parallel.
+
+    :param nums: the given numbers to encrypt, assuming each is less than n
+    :type nums: list[int]
+    :param pub_key: the recipient's public key (n, e)
+    :type pub_key: tuple[int] | keys.PublicKey
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of numbers dispatched to a worker at once. None splits the numbers evenly
+    :type chunksize: int | None
+    :return: the encrypted numbers, in the same order
+    :rtype: list[int]
+    """
+
+    return map_blocks(num_encryption, nums, pub_key, jobs, chunksize)
+
+
+def num_decryption_batch(nums, private_key, jobs=None, chunksize=None, cache=None):
+    """
+    decrypts a list of numbers with the same private key, in parallel.
+    with a cache, only the numbers missing from it are decrypted, each of them once, and are then cached.
+
+    :param nums: the given numbers to decrypt, assuming each is less than n
+    :type nums: list[int]
+    :param private_key: the recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int] | keys.PrivateKey
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of numbers dispatched to a worker at once. None splits the numbers evenly
+    :type chunksize: int | None
+    :param cache: optional cache of decrypted blocks. None disables it
+    :type cache: decryption_cache.DecryptionCache | None
+    :return: the decrypted numbers, in the same order
+    :rtype: list[int]
+    """
+
+    if cache is None:
+        return map_blocks(num_decryption, nums, private_key, jobs, chunksize)
+
+    fingerprint = keys.get_private_key(private_key).secret_fingerprint  # n alone doesn't prove the key
+    results = [cache.get(fingerprint, num) for num in nums]
+
+    # the missing numbers are decrypted once each, even if repeated in the batch
+    missing = list(dict.fromkeys(num for num, result in zip(nums, results) if result is None))
+    decrypted = dict(zip(missing, map_blocks(num_decryption, missing, private_key, jobs, chunksize)))
+    for num, decrypted_num in decrypted.items():
+        cache.put(fingerprint, num, decrypted_num)
+
+    return [decrypted[num] if result is None else result for num, result in zip(nums, results)]
+
+
+def encrypt_parallel(msg, pub_key, jobs=None, chunksize=None):
+    """
+    encrypts a message like encrypt, spreading the blocks over a process pool.
+
+    :param msg: the given message to be encrypted.
+    :type msg: str
+    :param pub_key: recipient's public key (n, e).
+    :type pub_key: tuple[int] | keys.PublicKey
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of blocks dispatched to a worker at once. None splits the blocks evenly
+    :type chunksize: int | None
+    :return: list of integers representing encrypted blocks of the message.
+    :rtype: list[int]
+    """
+
+    padded_blocks = pad_message(msg.encode('utf-8'), pub_key)
+    return num_encryption_batch(padded_blocks, pub_key, jobs, chunksize)
+
+
+def decrypt_parallel(encrypted_blocks, private_key, jobs=None, chunksize=None, cache=None):
+    """
+    decrypts a list of encrypted blocks like decrypt, spreading the blocks over a process pool.
+
+    :param encrypted_blocks: list of integers representing encrypted blocks of the message.
+    :type encrypted_blocks: list[int]
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int] | keys.PrivateKey
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of blocks dispatched to a worker at once. None splits the blocks evenly
+    :type chunksize: int | None
+    :param cache: optional cache of decrypted blocks, so that repeated blocks are decrypted once. None disables it
+    :type cache: decryption_cache.DecryptionCache | None
+    :return: The decrypted message.
+    :rtype: str
+    """
+
+    decrypted_blocks = num_decryption_batch(encrypted_blocks, private_key, jobs, chunksize, cache)
+    return unpad_message(decrypted_blocks, private_key).decode('utf-8')
+
+
+def iter_encrypt(in_file, pub_key):
+    """
+    encrypts a binary file object block by block using RSA encryption with PKCS#1 v1.5 padding.
+    only STREAM_BLOCKS blocks of the file are held in memory at a time.
+
+    :param in_file: binary file object to read the plain bytes from
+    :type in_file: typing.BinaryIO
+    :param pub_key: recipient's public key (n, e).
+    :type pub_key: tuple[int] | keys.PublicKey
+    :return: generator of integers representing encrypted blocks of the file.
+    :rtype: generator[int]
+    """
+
+    block_size = keys.get_public_key(pub_key).block_size  # same block size as encrypt
+
+    # reading STREAM_BLOCKS blocks at a time, so their padding is drawn at once
+    chunk = in_file.read((block_size - 11) * STREAM_BLOCKS)  # Subtract 11 for padding
+    while chunk:
+        for padded_block in pad_message(chunk, pub_key):
+            yield num_encryption(padded_block, pub_key)
+        chunk = in_file.read((block_size - 11) * STREAM_BLOCKS)
+
+
+def iter_decrypt(in_file, private_key):
+    """
+    decrypts a binary file object written by encrypt_stream block by block.
+    only a single block of the file is held in memory at a time.
+
+    :param in_file: binary file object to read the container from
+    :type in_file: typing.BinaryIO
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int] | keys.PrivateKey
+    :return: generator of the decrypted bytes of each block.
+    :rtype: generator[bytes]
+    """
+
+    private_key = keys.get_private_key(private_key)
+
+    width, fingerprint = ciphertext_file.read_header(in_file.read(ciphertext_file.HEADER.size))
+    if fingerprint != private_key.fingerprint:
+        raise ValueError("Encrypted file was encrypted under a different modulus")
+
+    data = in_file.read(width)
+    while data:
+        if len(data) != width:
+            raise ValueError("Encrypted file is truncated")
+        decrypted_block = num_decryption(int.from_bytes(data, byteorder='big'), private_key)
+        yield pkcs1_v1_5_unpad_int(decrypted_block, width)
+        data = in_file.read(width)
+
+
+def encrypt_stream(in_file, out_file, pub_key):
+    """
+    encrypts a binary file object into a container file object (see ciphertext_file), with bounded memory.
+    each encrypted block is written as fixed-width big-endian bytes, as wide as the modulus.
+
+    :param in_file: binary file object to read the plain bytes from
+    :type in_file: typing.BinaryIO
+    :param out_file: binary file object to write the container to
+    :type out_file: typing.BinaryIO
+    :param pub_key: recipient's public key (n, e).
+    :type pub_key: tuple[int] | keys.PublicKey
+    :return: the amount of encrypted blocks written
+    :rtype: int
+    """
+
+    width = ciphertext_file.write_header(out_file, pub_key[0])
+
+    count = 0
+    for encrypted_block in iter_encrypt(in_file, pub_key):
+        out_file.write(encrypted_block.to_bytes(width, byteorder='big'))
+        count += 1
+    return count
+
+
+def decrypt_stream(in_file, out_file, private_key):
+    """
+    decrypts a binary file object written by encrypt_stream into another, with bounded memory.
+
+    :param in_file: binary file object to read the container from
+    :type in_file: typing.BinaryIO
+    :param out_file: binary file object to write the decrypted bytes to
+    :type out_file: typing.BinaryIO
+    :param private_key: recipient's private key (n, d, p, q, dP, dQ, qInv), or a legacy (n, d) key
+    :type private_key: tuple[int] | keys.PrivateKey
+    :return: the amount of decrypted blocks
+    :rtype: int
+    """
 
+    count = 0
+    for message_block in iter_decrypt(in_file, private_key):
+        out_file.write(message_block)
+        count += 1
+    return count
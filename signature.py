@@ -0,0 +1,280 @@
+import hashlib
+import hmac
+import os
+import keys
+import rsa
+
+# signature schemes, both over a SHA-256 digest of the message
+SCHEMES = ('pkcs1', 'pss')
+
+# DER encoding of the SHA-256 AlgorithmIdentifier, prepended to the digest by PKCS#1 v1.5 signatures
+SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
+DIGEST_SIZE = 32
+SALT_SIZE = 32  # PSS salt, as long as the digest
+
+# encoded message without the digest, per encoded length: the digest is added to it as an integer
+pkcs1_prefixes = {}
+
+
+def digest(message):
+    """
+    computes the SHA-256 digest of a message to be signed.
+
+    :param message: the message, str messages are encoded with utf-8
+    :type message: str | bytes
+    :return: the digest
+    :rtype: bytes
+    """
+
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return hashlib.sha256(message).digest()
+
+
+def pkcs1_v1_5_encode(message_digest, length):
+    """
+    applies EMSA-PKCS1-v1_5 encoding to a SHA-256 digest, as an integer.
+    the fixed part of the encoding is built once per length, so only the digest is converted for each message.
+
+    :param message_digest: the SHA-256 digest
+    :type message_digest: bytes
+    :param length: the length of the encoded message in bytes, the modulus length
+    :type length: int
+    :return: the encoded message, as the integer of its big-endian bytes
+    :rtype: int
+    """
+
+    if length not in pkcs1_prefixes:
+        padding_length = length - len(SHA256_DIGEST_INFO) - DIGEST_SIZE - 3
+        if padding_length < 8:
+            raise ValueError("Key too short for a PKCS#1 v1.5 SHA-256 signature")
+
+        # 0x00, 0x01, 0xff padding, 0x00, then the DigestInfo, whose last DIGEST_SIZE bytes are left for the digest
+        prefix = b'\x00\x01' + b'\xff' * padding_length + b'\x00' + SHA256_DIGEST_INFO
+        pkcs1_prefixes[length] = int.from_bytes(prefix, byteorder='big') << (8 * DIGEST_SIZE)
+
+    return pkcs1_prefixes[length] | int.from_bytes(message_digest, byteorder='big')
+
+
+def mgf1(seed, length):
+    """
+    MGF1 mask generation function over SHA-256.
+
+    :param seed: the seed
+    :type seed: bytes
+    :param length: the length of the mask in bytes
+    :type length: int
+    :return: the mask
+    :rtype: bytes
+    """
+
+    mask = b''.join(hashlib.sha256(seed + counter.to_bytes(4, byteorder='big')).digest()
+                    for counter in range(-(-length // DIGEST_SIZE)))
+    return mask[:length]
+
+
+def pss_encode(message_digest, em_bits):
+    """
+    applies EMSA-PSS encoding to a SHA-256 digest, with a random salt of SALT_SIZE bytes.
+
+    :param message_digest: the SHA-256 digest
+    :type message_digest: bytes
+    :param em_bits: the maximal bit length of the encoded message, one less than the modulus'
+    :type em_bits: int
+    :return: the encoded message, as the integer of its big-endian bytes
+    :rtype: int
+    """
+
+    em_length = (em_bits + 7) // 8
+    if em_length < DIGEST_SIZE + SALT_SIZE + 2:
+        raise ValueError("Key too short for a PSS SHA-256 signature")
+
+    salt = os.urandom(SALT_SIZE)
+    h = hashlib.sha256(b'\x00' * 8 + message_digest + salt).digest()
+
+    # data block: zero padding, a 0x01 byte, then the salt. it is masked with MGF1 of h
+    db_length = em_length - DIGEST_SIZE - 1
+    db = b'\x00' * (db_length - SALT_SIZE - 1) + b'\x01' + salt
+    masked_db = int.from_bytes(db, byteorder='big') ^ int.from_bytes(mgf1(h, db_length), byteorder='big')
+    masked_db &= (1 << (em_bits - 8 * DIGEST_SIZE - 8)) - 1  # clear the bits above em_bits
+
+    # encoded message: masked data block, h, then a 0xbc byte
+    return (((masked_db << (8 * DIGEST_SIZE)) | int.from_bytes(h, byteorder='big')) << 8) | 0xbc
+
+
+def pss_verify(message_digest, em, em_bits):
+    """
+    checks an EMSA-PSS encoded message against a SHA-256 digest.
+
+    :param message_digest: the SHA-256 digest
+    :type message_digest: bytes
+    :param em: the encoded message, as an integer
+    :type em: int
+    :param em_bits: the maximal bit length of the encoded message, one less than the modulus'
+    :type em_bits: int
+    :return: True if the encoded message matches the digest, False otherwise
+    :rtype: bool
+    """
+
+    em_length = (em_bits + 7) // 8
+    if em_length < DIGEST_SIZE + SALT_SIZE + 2 or em >> em_bits or em & 0xff != 0xbc:
+        return False
+
+    db_length = em_length - DIGEST_SIZE - 1
+    h = ((em >> 8) & ((1 << (8 * DIGEST_SIZE)) - 1)).to_bytes(DIGEST_SIZE, byteorder='big')
+    masked_db = em >> (8 * DIGEST_SIZE + 8)
+
+    db = masked_db ^ int.from_bytes(mgf1(h, db_length), byteorder='big')
+    db &= (1 << (em_bits - 8 * DIGEST_SIZE - 8)) - 1  # the bits above em_bits are not part of the data block
+
+    # the data block has to be zero padding, then a 0x01 byte, then the salt
+    if db >> (8 * SALT_SIZE) != 1:
+        return False
+    salt = (db & ((1 << (8 * SALT_SIZE)) - 1)).to_bytes(SALT_SIZE, byteorder='big')
+
+    return hmac.compare_digest(hashlib.sha256(b'\x00' * 8 + message_digest + salt).digest(), h)
+
+
+def sign(message, private_key, scheme='pkcs1'):
+    """
+    signs a message with RSA, over its SHA-256 digest.
+    the signature is verified before it is returned, a faulty one raises RuntimeError instead.
+
+    :param message: the message to be signed, str messages are encoded with utf-8
+    :type message: str | bytes
+    :param private_key: the signer's private key (n, d, p, q, dP, dQ, qInv)
+    :type private_key: tuple[int] | keys.PrivateKey
+    :param scheme: 'pkcs1' for PKCS#1 v1.5 signatures, 'pss' for PSS signatures
+    :type scheme: str
+    :return: the signature, as big-endian bytes as long as the modulus
+    :rtype: bytes
+    """
+
+    key = keys.get_private_key(private_key)
+    message_digest = digest(message)
+
+    if scheme == 'pkcs1':
+        encoded = pkcs1_v1_5_encode(message_digest, key.byte_length)
+    elif scheme == 'pss':
+        encoded = pss_encode(message_digest, key.n.bit_length() - 1)
+    else:
+        raise ValueError(f"Unknown signature scheme: {scheme}")
+
+    # the private-key operation, constant-time and split over CRT when the key has its CRT parameters
+    signature = rsa.num_decryption(encoded, key)
+
+    # a fault in one CRT half would give away a prime factor through gcd(signature^e - encoded, n) (Bellcore attack),
+    # so the signature is checked with the public exponent before it is released. legacy keys don't use CRT
+    if key.crt and rsa.num_encryption(signature, (key.n, key.public_exponent)) != encoded:
+        raise RuntimeError("Signature verification failed, the signature was not released")
+
+    return signature.to_bytes(key.byte_length, byteorder='big')
+
+
+def check_encoded(message_digest, encoded, key, scheme):
+    """
+    checks an encoded message, recovered from a signature, against a message's digest.
+
+    :param message_digest: the SHA-256 digest of the message
+    :type message_digest: bytes
+    :param encoded: the signature raised to the public exponent
+    :type encoded: int
+    :param key: the signer's public key
+    :type key: keys.PublicKey
+    :param scheme: 'pkcs1' or 'pss'
+    :type scheme: str
+    :return: True if the signature is valid, False otherwise
+    :rtype: bool
+    """
+
+    if scheme == 'pkcs1':
+        # the expected encoding is rebuilt and compared as an integer, nothing is decoded
+        return encoded == pkcs1_v1_5_encode(message_digest, key.byte_length)
+    return pss_verify(message_digest, encoded, key.n.bit_length() - 1)
+
+
+def signature_num(signature, key):
+    """
+    converts a signature to an integer, if it is well-formed for a key.
+
+    :param signature: the signature
+    :type signature: bytes
+    :param key: the signer's public key
+    :type key: keys.PublicKey
+    :return: the signature as an integer, or None if its length is wrong or it isn't less than n
+    :rtype: int | None
+    """
+
+    if len(signature) != key.byte_length:
+        return None
+    num = int.from_bytes(signature, byteorder='big')
+    return num if num < key.n else None
+
+
+def verify(message, signature, pub_key, scheme='pkcs1'):
+    """
+    verifies an RSA signature of a message.
+    the public exponent is short (65537), so the exponentiation goes through the fast public backend,
+    not the constant-time ladder used for private keys: nothing secret is involved in verification.
+
+    :param message: the signed message, str messages are encoded with utf-8
+    :type message: str | bytes
+    :param signature: the signature, as returned by sign
+    :type signature: bytes
+    :param pub_key: the signer's public key (n, e)
+    :type pub_key: tuple[int] | keys.PublicKey
+    :param scheme: 'pkcs1' for PKCS#1 v1.5 signatures, 'pss' for PSS signatures
+    :type scheme: str
+    :return: True if the signature is valid, False otherwise
+    :rtype: bool
+    """
+
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown signature scheme: {scheme}")
+
+    key = keys.get_public_key(pub_key)
+    num = signature_num(signature, key)
+    if num is None:
+        return False
+
+    return check_encoded(digest(message), rsa.num_encryption(num, key), key, scheme)
+
+
+def verify_batch(messages, signatures, pub_key, scheme='pkcs1', jobs=1, chunksize=None):
+    """
+    verifies many RSA signatures made with the same key, in one call.
+    the key object and the fixed part of the encoding are set up once for the whole batch,
+    and the exponentiations can be spread over a process pool for big batches.
+
+    :param messages: the signed messages, str messages are encoded with utf-8
+    :type messages: list[str | bytes]
+    :param signatures: the signatures, in the messages' order
+    :type signatures: list[bytes]
+    :param pub_key: the signer's public key (n, e)
+    :type pub_key: tuple[int] | keys.PublicKey
+    :param scheme: 'pkcs1' for PKCS#1 v1.5 signatures, 'pss' for PSS signatures
+    :type scheme: str
+    :param jobs: the amount of worker processes. None uses all the available cores, 1 works in this process
+    :type jobs: int | None
+    :param chunksize: the amount of signatures dispatched to a worker at once. None splits them evenly
+    :type chunksize: int | None
+    :return: for each signature, True if it is valid, False otherwise
+    :rtype: list[bool]
+    """
+
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown signature scheme: {scheme}")
+    if len(messages) != len(signatures):
+        raise ValueError("Expected a signature for every message")
+
+    key = keys.get_public_key(pub_key)
+    nums = [signature_num(signature, key) for signature in signatures]
+
+    # malformed signatures are rejected without an exponentiation
+    well_formed = [i for i, num in enumerate(nums) if num is not None]
+    encoded = rsa.num_encryption_batch([nums[i] for i in well_formed], key, jobs, chunksize)
+
+    results = [False] * len(signatures)
+    for i, encoded_num in zip(well_formed, encoded):
+        results[i] = check_encoded(digest(messages[i]), encoded_num, key, scheme)
+    return results
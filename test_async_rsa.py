@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import async_rsa
+
+
+def test_round_trip():
+    async def main():
+        async with async_rsa.AsyncRSA(concurrency=2) as rsa_async:
+            pub, priv = await rsa_async.generate_keys(1024)
+            encrypted = await rsa_async.encrypt('hello, asyncio', pub)
+            return await rsa_async.decrypt(encrypted, priv)
+
+    assert asyncio.run(main()) == 'hello, asyncio'
+
+
+def test_cancel_generate_keys():
+    async def main():
+        async with async_rsa.AsyncRSA(concurrency=2) as rsa_async:
+            task = asyncio.ensure_future(rsa_async.generate_keys(4096))
+            await asyncio.sleep(0.2)
+            start = time.perf_counter()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            elapsed = time.perf_counter() - start
+
+            # the slots of the cancelled searches are free again
+            prime = await asyncio.wait_for(rsa_async.generate_prime(256), 60)
+            return elapsed, prime
+
+    elapsed, prime = asyncio.run(main())
+    assert elapsed < 1
+    assert prime.bit_length() == 256
+
+
+def test_concurrency_limit():
+    lock = threading.Lock()
+    running = [0, 0]  # jobs running now, most jobs running at once
+
+    def job():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        # the executor has more workers than slots, so only the semaphore limits the jobs
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            rsa_async = async_rsa.AsyncRSA(concurrency=2, executor=executor)
+            await asyncio.gather(*(rsa_async.run(job) for _ in range(10)))
+
+    asyncio.run(main())
+    assert running[1] == 2
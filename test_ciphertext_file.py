@@ -0,0 +1,15 @@
+import io
+import pytest
+import ciphertext_file
+
+
+def test_text_blocks_round_trip(tmp_path):
+    blocks = [0, 12345, 1 << 2047, (1 << 40000) - 1]
+    path = str(tmp_path / 'message.txt')
+    ciphertext_file.save_text_blocks(path, blocks)
+    assert ciphertext_file.load_text_blocks(path) == blocks
+
+
+def test_text_blocks_bad_format():
+    with pytest.raises(ValueError):
+        list(ciphertext_file.iter_text_blocks(io.StringIO(f'{ciphertext_file.TEXT_HEADER}now\n12345\n')))
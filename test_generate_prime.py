@@ -0,0 +1,142 @@
+import math
+import multiprocessing
+import os
+import subprocess
+import sys
+import pytest
+import generate_prime
+import low_level_prime
+
+
+def test_get_primes_small_sizes_with_pool():
+    # sizes too small for the windowed search are searched one by one, instead of waiting on empty windows
+    primes = generate_prime.get_primes(16, 3, jobs=2)
+    assert len(set(primes)) == 3
+    assert all(generate_prime.check_prime(prime) for prime in primes)
+    assert generate_prime.check_prime(generate_prime.get_prime(8, jobs=2))
+
+
+def test_get_primes_with_pool():
+    primes = generate_prime.get_primes(256, 2, jobs=2)
+    assert len(set(primes)) == 2
+    assert all(prime.bit_length() == 256 and generate_prime.check_prime(prime) for prime in primes)
+
+
+def test_prime_table_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_prime, 'TABLE_DIR', str(tmp_path))
+    monkeypatch.setattr(generate_prime, 'prime_tables', {})
+    table = generate_prime.get_prime_table(100)
+    assert low_level_prime.load_prime_table(str(tmp_path / 'small_primes_100.bin')) == table
+
+    # a table built with other product sizes is stale, and is rebuilt with the current ones
+    monkeypatch.setattr(low_level_prime, 'RESIDUE_PRODUCT_BITS', 120)
+    monkeypatch.setattr(generate_prime, 'prime_tables', {})
+    with pytest.raises(ValueError):
+        low_level_prime.load_prime_table(str(tmp_path / 'small_primes_100.bin'))
+    _, residue_products, _ = generate_prime.get_prime_table(100)
+    assert all(product.bit_length() <= 120 for product, _ in residue_products)
+    assert low_level_prime.load_prime_table(str(tmp_path / 'small_primes_100.bin'))[1] == residue_products
+
+
+def test_broken_numpy_falls_back(tmp_path):
+    # a NumPy install that fails on import, shadowing the real one
+    (tmp_path / 'numpy').mkdir()
+    (tmp_path / 'numpy' / '__init__.py').write_text("raise ImportError('broken install')\n")
+    code = ('import generate_prime; prime = generate_prime.get_prime(256); '
+            'assert not generate_prime.has_numpy() and generate_prime.check_prime(prime)')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path), os.path.dirname(generate_prime.__file__)]))
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+
+def test_get_primes_stops_workers():
+    before = set(multiprocessing.active_children())  # other tests' pools may still be shutting down
+    for _ in range(2):
+        primes = generate_prime.get_primes(1024, 1, jobs=3)
+        assert len(primes) == 1
+        # the running windows were stopped, not left in the background
+        assert set(multiprocessing.active_children()) <= before
+
+
+def test_search_window_stops(monkeypatch):
+    event = multiprocessing.Event()
+    event.set()
+    monkeypatch.setattr(generate_prime, 'stop_event', event)
+    assert generate_prime.search_window(1024) is None
+
+
+def is_prime_trial_division(n):
+    return n > 1 and all(n % i for i in range(2, math.isqrt(n) + 1))
+
+
+SMALL_PRIMES = [p for p in range(3, 200) if is_prime_trial_division(p)]
+STRONG_LUCAS_PSEUDOPRIMES = [5459, 5777, 10877, 16109, 18971, 22499, 24569, 25199, 40309, 58519]
+CARMICHAEL_NUMBERS = [561, 1105, 1729, 2465, 2821, 6601, 8911, 41041, 825265, 321197185, 5394826801, 232250619601,
+                      9746347772161]
+
+
+def test_jacobi():
+    for p in SMALL_PRIMES:
+        for a in range(-p, 2 * p):
+            euler = pow(a, (p - 1) // 2, p)  # Euler's criterion: 1, p - 1 or 0
+            assert generate_prime.jacobi(a, p) == (-1 if euler == p - 1 else euler)
+
+    # multiplicative in the denominator
+    for p, q in [(3, 5), (7, 11), (13, 13), (101, 3)]:
+        for a in range(50):
+            assert generate_prime.jacobi(a, p * q) == generate_prime.jacobi(a, p) * generate_prime.jacobi(a, q)
+
+
+def test_strong_lucas_pseudoprimes():
+    for n in STRONG_LUCAS_PSEUDOPRIMES:
+        assert not is_prime_trial_division(n)
+        assert generate_prime.check_strong_lucas(n)
+        assert not generate_prime.check_baillie_psw(n)  # rejected by the base 2 Miller-Rabin test
+
+
+def test_baillie_psw_matches_trial_division():
+    for n in range(3, 100000, 2):
+        assert generate_prime.check_baillie_psw(n) == is_prime_trial_division(n), n
+
+
+def test_carmichael_numbers_rejected():
+    for n in CARMICHAEL_NUMBERS:
+        assert not generate_prime.check_baillie_psw(n)
+        assert not generate_prime.check_high_level_prime(n)
+        assert not generate_prime.check_prime(n)
+        assert not generate_prime.check_prime(n, lucas=True)
+
+
+@pytest.mark.parametrize('bits, rounds', [(100, 64), (478, 64), (479, 12), (905, 7), (906, 6), (1079, 6), (1080, 5),
+                                          (1344, 5), (1345, 4), (4096, 4)])
+def test_miller_rabin_rounds(bits, rounds):
+    assert generate_prime.get_miller_rabin_rounds(bits) == rounds
+
+
+@pytest.mark.parametrize('lucas', [False, True])
+def test_collect_stats_merges_workers(lucas):
+    with generate_prime.collect_stats() as stats:
+        primes = generate_prime.get_primes(512, 2, jobs=2, lucas=lucas)
+    assert generate_prime.stats is None
+
+    assert len(primes) == 2
+    assert stats.windows >= 1
+    assert stats.candidates >= stats.low_level_rejected >= 0
+    assert stats.candidates > stats.low_level_rejected  # the primes themselves reached the probabilistic tests
+    if lucas:
+        assert stats.lucas_tests >= 2
+    else:
+        assert stats.miller_rabin_rounds >= 2
+    assert stats.elapsed_seconds > 0
+    assert 'Sieve windows drawn' in stats.report()
+
+
+def test_collect_stats_nested():
+    with pytest.raises(KeyError):
+        with generate_prime.collect_stats() as outer:
+            with generate_prime.collect_stats() as inner:
+                generate_prime.get_prime(256)
+            assert generate_prime.stats is outer
+            outer.merge(inner)
+            raise KeyError
+    assert generate_prime.stats is None
+    assert outer.as_dict()['windows'] == inner.windows >= 1
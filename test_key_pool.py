@@ -0,0 +1,26 @@
+import os
+import stat
+import pytest
+import key_pool
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='file modes are POSIX only')
+def test_persisted_keys_are_private(tmp_path):
+    path = str(tmp_path / 'pool')
+    with key_pool.KeyPool(sizes=(512,), capacity=2, low_water=1, path=path) as pool:
+        with pool.available:
+            assert pool.available.wait_for(lambda: len(pool.queues[512]) == 2, timeout=60)
+
+    names = os.listdir(path)
+    assert len(names) == 2
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o700
+    assert all(stat.S_IMODE(os.stat(os.path.join(path, name)).st_mode) == 0o600 for name in names)
+
+
+def test_refills_at_zero_low_water():
+    with key_pool.KeyPool(sizes=(512,), capacity=1, low_water=0) as pool:
+        for _ in range(3):
+            public, private = pool.get(512, timeout=60)
+            assert public[0] == private[0]
+            with pool.available:
+                assert len(pool.queues[512]) + pool.pending[512] == 1  # the taken key pair is being replaced
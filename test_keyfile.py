@@ -0,0 +1,34 @@
+import os
+import stat
+import pytest
+import keyfile
+from test_rsa import make_keys
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='file modes are POSIX only')
+
+
+def file_mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+@pytest.mark.parametrize('save', [keyfile.save_keys, keyfile.save_binary_keys])
+def test_private_key_file_mode(tmp_path, save):
+    pub, priv = make_keys(512)
+    path = str(tmp_path / 'keys')
+
+    with open(path, 'w'):
+        pass
+    os.chmod(path, 0o644)  # an existing world-readable file
+    save(path, pub, priv)
+    assert file_mode(path) == 0o600
+    assert keyfile.load_keys(path) == (pub, priv)
+
+    public_path = str(tmp_path / 'public')
+    save(public_path, pub)
+    assert file_mode(public_path) == 0o666 & ~current_umask()
@@ -0,0 +1,13 @@
+import keys
+
+
+def test_key_equality():
+    pub = keys.PublicKey(3233, 17)
+    priv = keys.PrivateKey(3233, 413, 61, 53, 53, 49, 38)
+
+    assert pub == (3233, 17) and pub == keys.PublicKey(3233, 17)
+    assert priv == (3233, 413, 61, 53, 53, 49, 38)
+    assert pub != priv
+    assert pub != None and priv != None
+    assert pub not in [None, 5, 'key'] and priv not in [None, 5, 'key']
+    assert hash(pub) == hash((3233, 17))
@@ -0,0 +1,57 @@
+import os
+import pytest
+import keyfile
+import main
+from test_rsa import make_keys
+
+
+@pytest.fixture
+def key_files(tmp_path):
+    paths = []
+    for name in ('alice.key', 'bob.key'):
+        public, private = make_keys()
+        paths.append(str(tmp_path / name))
+        keyfile.save_binary_keys(paths[-1], public, private)
+    return paths
+
+
+@pytest.mark.parametrize('hybrid', [False, True])
+def test_failed_decrypt_leaves_no_output(tmp_path, key_files, hybrid):
+    message, encrypted, decrypted = (str(tmp_path / name) for name in ('message.txt', 'message.enc', 'message.dec'))
+    with open(message, 'wb') as f:
+        f.write(b'attack at dawn\n' * 100)
+
+    assert main.main(['encrypt', '--key', key_files[0], '--in', message, '--out', encrypted]
+                     + (['--hybrid'] if hybrid else [])) == main.EXIT_OK
+    assert main.main(['decrypt', '--key', key_files[0], '--in', encrypted, '--out', decrypted]) == main.EXIT_OK
+    with open(message, 'rb') as f, open(decrypted, 'rb') as g:
+        assert f.read() == g.read()
+    os.remove(decrypted)
+
+    # wrong key
+    assert main.main(['decrypt', '--key', key_files[1], '--in', encrypted, '--out', decrypted]) == main.EXIT_FAILURE
+    assert not os.path.exists(decrypted)
+
+    # truncated input, over an existing output
+    with open(encrypted, 'rb') as f:
+        data = f.read()
+    with open(encrypted, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with open(decrypted, 'wb') as f:
+        f.write(b'previous output')
+    assert main.main(['decrypt', '--key', key_files[0], '--in', encrypted, '--out', decrypted]) == main.EXIT_FAILURE
+    with open(decrypted, 'rb') as f:
+        assert f.read() == b'previous output'
+
+    assert sorted(os.listdir(tmp_path)) == ['alice.key', 'bob.key', 'message.dec', 'message.enc', 'message.txt']
+
+
+def test_interactive_file_decryption_error(monkeypatch, capsys):
+    def fail(private):
+        raise ValueError("Key doesn't match the encrypted file")
+
+    answers = iter(['5', '0'])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    monkeypatch.setattr(main, 'rsa_file_decryption', fail)
+    main.interactive()
+    assert "Decryption failed: Key doesn't match the encrypted file" in capsys.readouterr().out
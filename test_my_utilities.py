@@ -0,0 +1,46 @@
+import random
+import pytest
+import my_utilities
+
+
+@pytest.mark.parametrize('num', [0, 7, 10 ** 1023, 10 ** 1024 - 1, 10 ** 1024, 1 << 27213, 10 ** 8192 - 1, 10 ** 8192,
+                                 10 ** 20000 + 1], ids=lambda num: f'{num.bit_length()}bits')
+def test_int_to_decimal_boundaries(num):
+    assert my_utilities.int_from_decimal(my_utilities.int_to_decimal(num)) == num
+
+
+def test_decimal_round_trip_random():
+    rng = random.Random(0)
+    for bits in [100, 3402, 13606, 27213, 32902, 70000]:
+        num = rng.getrandbits(bits) | (1 << (bits - 1))
+        digits = my_utilities.int_to_decimal(num)
+        assert digits[0] != '0'
+        assert my_utilities.int_from_decimal(digits) == num
+
+
+def test_int_from_decimal_rejects_non_decimal():
+    with pytest.raises(ValueError):
+        my_utilities.int_from_decimal('12a4')
+    with pytest.raises(ValueError):
+        my_utilities.int_from_decimal('-5')
+
+
+@pytest.mark.parametrize('N', [3, 255, 256, 2 ** 61 - 1, 2 ** 64, random.Random(1).getrandbits(512) | 1,
+                               random.Random(2).getrandbits(2048) | (1 << 2047)], ids=lambda N: f'{N.bit_length()}bits')
+def test_barrett_reduction(monkeypatch, N):
+    monkeypatch.setattr(my_utilities, 'BARRETT_MIN_BITS', 0)  # Barrett reduction for every modulus
+    context = my_utilities.ModContext(N)
+    assert context.mu is not None
+
+    rng = random.Random(N)
+    values = [0, 1, 2, N // 2, N - 2, N - 1] + [rng.randrange(N) for _ in range(50)]
+    for t in [0, N - 1, N, N + 1, N * N - N, N * N - 2, N * N - 1] + [rng.randrange(N * N) for _ in range(50)]:
+        assert context.reduce(t) == t % N
+    for a in values:
+        assert context.sqr(a) == a * a % N
+        for b in values[:10]:
+            assert context.mul(a, b) == a * b % N
+    powers = [(2, N - 1), (N - 1, 65537), (0, 5), (7, 0)] + [(rng.randrange(N), rng.getrandbits(256)) for _ in range(5)]
+    for x, k in powers:
+        assert context.ladder(x, k) == pow(x, k, N)
+        assert context.pow(x, k, my_utilities.PRIVATE_BACKEND) == pow(x, k, N)
@@ -0,0 +1,95 @@
+import os
+import threading
+import pytest
+import generate_prime
+import rsa
+from decryption_cache import DecryptionCache
+
+
+def make_keys(bits=1024, primes=2):
+    """
+    builds a key pair from freshly generated primes, smaller than generate_keys allows, to keep the tests fast.
+    """
+
+    return rsa.get_keys(*(generate_prime.get_prime(bits // primes) for _ in range(primes)))
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.parametrize('message', [b'', b'a', b'\x00\x00', b'\x00\x01\x00\x00', os.urandom(117)])
+def test_pkcs1_v1_5_round_trip(message):
+    padded = rsa.pkcs1_v1_5_pad(message, 128)
+    assert len(padded) == 129 and padded[:2] == b'\x00\x02'
+    assert b'\x00' not in padded[2:-len(message) - 2 or None]
+    assert rsa.pkcs1_v1_5_unpad(padded) == message
+
+
+@pytest.mark.parametrize('padded', [
+    b'\x00\x01' + b'\xff' * 10 + b'\x00\x00' + b'message',  # wrong block type
+    b'\x01\x02' + b'\xff' * 10 + b'\x00\x00' + b'message',  # wrong first byte
+    b'\x00\x02' + b'\xff' * 20,  # no separator
+    b'\x00\x02' + b'\xff' * 7 + b'\x00\x00' + b'message',  # padding string too short
+    b'\x00\x02' + b'\xff' * 5,  # too short for any padding
+])
+def test_pkcs1_v1_5_unpad_rejects(padded):
+    with pytest.raises(ValueError):
+        rsa.pkcs1_v1_5_unpad(padded)
+
+
+def test_pkcs1_v1_5_pad_rejects_long_message():
+    with pytest.raises(ValueError):
+        rsa.pkcs1_v1_5_pad(b'x' * 118, 128)
+
+
+@pytest.mark.parametrize('primes', [2, 3])
+def test_encrypt_round_trip(primes):
+    pub, priv = make_keys(1536, primes)
+    for message in ['', 'short', 'שלום עולם ' * 100, '\x00' * 300]:
+        assert rsa.decrypt(rsa.encrypt(message, pub), priv) == message
+
+
+def test_cached_decrypt_concurrent_keys():
+    key_pairs = [make_keys(), make_keys()]
+    messages = ['first message ' * 20, 'second message ' * 20]
+    encrypted = [rsa.encrypt(message, pub) for message, (pub, _) in zip(messages, key_pairs)]
+    cache = DecryptionCache()
+    failures = []
+
+    def worker(i):
+        k = i % 2
+        for _ in range(20):
+            try:
+                if rsa.decrypt(encrypted[k], key_pairs[k][1], cache=cache) != messages[k]:
+                    failures.append(k)
+            except Exception as e:
+                failures.append(e)
+
+    run_threads(worker, 4)
+    assert failures == []
+    assert rsa.worker_key is None  # no private key is left behind in the module
+
+
+def test_cache_misses_with_mismatched_key():
+    pub, priv = make_keys()
+    n, d = priv[:2]
+    encrypted = rsa.encrypt('secret', pub)
+    cache = DecryptionCache()
+    assert rsa.decrypt(encrypted, priv, cache=cache) == 'secret'
+
+    # a key that only shares the modulus doesn't read the cached plaintext
+    with pytest.raises(ValueError):
+        rsa.decrypt(encrypted, (n, 1), cache=cache)
+    assert cache.stats()['hits'] == 0
+
+    assert rsa.decrypt(encrypted, priv, cache=cache) == 'secret'
+    assert rsa.decrypt(encrypted, (n, d), cache=cache) == 'secret'  # the legacy form of the same key
+    assert cache.stats()['hits'] == 2
+
+    cache.clear(priv)
+    assert len(cache) == 1  # only the block decrypted with (n, 1) is left
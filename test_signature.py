@@ -0,0 +1,48 @@
+import pytest
+import keys
+import rsa
+import signature
+from test_rsa import make_keys, run_threads
+
+
+def test_verify_batch():
+    pub, priv = make_keys()
+    messages = [f'message {i}' for i in range(8)]
+    signatures = [signature.sign(message, priv) for message in messages]
+    signatures[3] = signatures[4]  # signature of another message
+    signatures[5] = signatures[5][:-1]  # malformed signature
+
+    expected = [i not in (3, 5) for i in range(8)]
+    assert signature.verify_batch(messages, signatures, pub) == expected
+    assert signature.verify_batch(messages, signatures, pub, jobs=2) == expected
+
+
+def test_verify_batch_concurrent_keys():
+    key_pairs = [make_keys(), make_keys()]
+    messages = [f'message {i}' for i in range(10)]
+    signatures = [[signature.sign(message, priv) for message in messages] for _, priv in key_pairs]
+    failures = []
+
+    def worker(i):
+        k = i % 2
+        for _ in range(20):
+            try:
+                if not all(signature.verify_batch(messages, signatures[k], key_pairs[k][0])):
+                    failures.append(k)
+            except Exception as e:
+                failures.append(e)
+
+    run_threads(worker, 4)
+    assert failures == []
+
+
+def test_sign_rejects_faulty_signature(monkeypatch):
+    pub, priv = make_keys()
+    assert keys.get_private_key(priv).public_exponent == pub[1]
+
+    # a faulty private-key operation, as a fault injected in one CRT half would give
+    num_decryption = rsa.num_decryption
+    monkeypatch.setattr(rsa, 'num_decryption', lambda num, key: num_decryption(num, key) ^ 1)
+    for scheme in signature.SCHEMES:
+        with pytest.raises(RuntimeError):
+            signature.sign('message', priv, scheme)